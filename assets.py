@@ -0,0 +1,127 @@
+# Sesleri ve dokuları arka plan iş parçacığında yükler; menü hemen açılır, oyun kodu dosya G/Ç'sinde hiç beklemez
+import os
+import threading
+import time
+from collections import deque
+from functools import partial
+
+from kivy.clock import Clock
+from kivy.core.audio import SoundLoader
+from kivy.core.image import ImageLoader
+from kivy.logger import Logger
+from kivy.utils import platform
+
+KIND_MUSIC = 'music'
+KIND_IMAGE = 'image'
+KIND_VOICES = 'voices'
+
+def open_music(path):
+    # SDL2'nin SoundSDL2 sağlayıcısı dosyanın tamamını belleğe çözer; MusicSDL2 (Mix_LoadMUS) çalarken akıtır.
+    # Android'in MediaPlayer sağlayıcısı zaten akıtarak çaldığı için orada SoundLoader seçimi korunur.
+    if platform != 'android':
+        try:
+            from kivy.core.audio.audio_sdl2 import MusicSDL2
+            return MusicSDL2(source=path)
+        except ImportError:
+            pass
+    return SoundLoader.load(path)
+
+def decode_image(path):
+    # Yalnızca çözme yapılır; GL dokusu ana iş parçacığında, ilk .texture erişiminde yüklenir
+    return ImageLoader.load(path)
+
+def load_voices(path, count):
+    # Aynı efektin birbirinden bağımsız çalabilen, önceden çözülmüş kopyaları
+    return [SoundLoader.load(path) for _ in range(count)]
+
+LOADERS = {KIND_MUSIC: open_music, KIND_IMAGE: decode_image}
+
+class StartupTimings:
+    # Açılış aşamalarının başlangıçtan itibaren geçen süreleri. report_after aşamalarının hepsi
+    # işaretlendiğinde, hangisi en son gelirse gelsin, süreler bir kez raporlanır.
+    def __init__(self, start=None, report_after=()):
+        self.start = time.perf_counter() if start is None else start
+        self.phases = []
+        self.waiting = set(report_after)
+
+    def mark(self, phase):
+        self.phases.append((phase, time.perf_counter() - self.start))
+        if phase in self.waiting:
+            self.waiting.discard(phase)
+            if not self.waiting:
+                self.report()
+
+    def report(self):
+        Logger.info("Startup: " + ", ".join(f"{phase}={seconds * 1000:.0f}ms" for phase, seconds in self.phases))
+
+class AssetManager:
+    # Varlıklar eklendikleri sırayla tek bir ön yükleyici iş parçacığında yüklenir; sonuçlar
+    # Clock üzerinden ana iş parçacığına aktarılır, bu yüzden hazır olma geri çağrıları da orada çalışır.
+    def __init__(self, timings=None):
+        self.timings = timings
+        self.queue = deque()
+        self.assets = {}
+        self.failed = set()
+        self.waiting = {}
+        self.load_times = {}
+        self.pending = 0
+        self.thread = None
+
+    def add(self, name, path, kind, voices=1):
+        self.queue.append((name, path, kind, voices))
+        self.pending += 1
+
+    def start(self):
+        self.thread = threading.Thread(target=self.run, name='asset-preloader', daemon=True)
+        self.thread.start()
+
+    def run(self):
+        while self.queue:
+            name, path, kind, voices = self.queue.popleft()
+            start = time.perf_counter()
+            try:
+                # Sağlayıcılar eksik dosyada da boş bir ses nesnesi döndürebildiği için önce dosya denetlenir
+                if not os.path.exists(path):
+                    raise FileNotFoundError(path)
+                asset = load_voices(path, voices) if kind == KIND_VOICES else LOADERS[kind](path)
+            except Exception as e:
+                Logger.warning(f"Assets: cannot load {path}: {e}")
+                asset = None
+            Clock.schedule_once(partial(self.finish, name, kind, asset, time.perf_counter() - start))
+
+    def finish(self, name, kind, asset, seconds, dt):
+        if kind == KIND_IMAGE and asset is not None:
+            start = time.perf_counter()
+            asset = asset.texture
+            seconds += time.perf_counter() - start
+        self.load_times[name] = seconds
+        self.pending -= 1
+        callbacks = self.waiting.pop(name, [])
+        if asset is None:
+            self.failed.add(name)
+        else:
+            self.assets[name] = asset
+            for callback in callbacks:
+                callback(asset)
+        if not self.pending:
+            Logger.info("Assets: " + ", ".join(f"{n}={s * 1000:.0f}ms" for n, s in self.load_times.items()))
+            if self.timings is not None:
+                self.timings.mark('assets_ready')
+
+    def get(self, name):
+        return self.assets.get(name)
+
+    def ready(self, name):
+        return name in self.assets
+
+    def when_ready(self, name, callback):
+        # Varlık yüklüyse hemen, değilse yüklendiğinde bir kez çağrılır; yüklenemezse hiç çağrılmaz
+        if name in self.assets:
+            callback(self.assets[name])
+        elif name not in self.failed:
+            self.waiting.setdefault(name, []).append(callback)
+
+    def stop(self, name):
+        sound = self.assets.get(name)
+        if sound is not None:
+            sound.stop()
@@ -0,0 +1,211 @@
+# Pencere açmadan oyun kurallarının hızını ölçer; ekransız CI makinelerinde performans gerilemesini yakalamak için
+import argparse
+import json
+import math
+import random
+import sys
+import time
+
+from engine import GameConfig, Game, Snake, FoodPlacer, FoodPlacementError, BodySampler, FOOD_REJECTION_SAMPLES
+from selfplay import WanderBot
+
+BENCH_LENGTHS = (10, 1000, 10000, 100000)
+BENCH_TICKS = 2000
+SPAWN_ROUNDS = 20
+ARENA_WIDTH = 1080
+WALL_MARGIN = 40
+ROW_SPACING = 10
+CHECK_ARENA = 500
+CHECK_DENSITIES = (1.5, 2.0, 2.5)
+CHECK_SEEDS = 6
+CHECK_INTERVAL = 5
+CHECK_MAX_TICKS = 20000
+
+class Serpentine:
+    # Yılanı satır satır zikzak çizdirir; satırlar arası ROW_SPACING çarpışma eşiğinden büyüktür
+    def __init__(self, config):
+        self.left = WALL_MARGIN
+        self.right = config.width - WALL_MARGIN
+        self.climb_ticks = ROW_SPACING // config.snake_speed
+        self.heading = 1
+        self.climb = 0
+    def steer(self, snake):
+        if self.climb:
+            self.climb -= 1
+            if not self.climb:
+                self.heading = -self.heading
+                snake.change_direction([self.heading, 0])
+            return
+        x = snake.head_pos[0]
+        if (self.heading > 0 and x >= self.right) or (self.heading < 0 and x <= self.left):
+            snake.change_direction([0, 1])
+            self.climb = self.climb_ticks
+
+def bench_config(length, ticks, density):
+    # Başlangıç ortadadır ve yol yukarı doğru büyür; arena, uzunluk + ölçüm adımlarını sığdıracak kadar yüksektir
+    steps_per_row = (ARENA_WIDTH - 2 * WALL_MARGIN) // 5
+    rows = (length + 2 * ticks) // steps_per_row + 2
+    height = 2 * (rows * ROW_SPACING + 2 * WALL_MARGIN)
+    return GameConfig(ARENA_WIDTH, height, density=density)
+
+def grow_snake(config, length):
+    snake = Snake(config)
+    steering = Serpentine(config)
+    snake.growth_pending = max(0, length - snake.length)
+    while snake.growth_pending:
+        steering.steer(snake)
+        snake.update()
+    return snake, steering
+
+def rate(count, seconds):
+    return count / seconds if seconds > 0 else float('inf')
+
+def bench_movement(snake, steering, ticks):
+    elapsed = 0.0
+    for _ in range(ticks):
+        steering.steer(snake)
+        start = time.perf_counter()
+        snake.update()
+        elapsed += time.perf_counter() - start
+    return rate(ticks, elapsed)
+
+def bench_collision(snake, steering, ticks):
+    elapsed = 0.0
+    for _ in range(ticks):
+        steering.steer(snake)
+        snake.update()
+        start = time.perf_counter()
+        collided = snake.check_collision()
+        elapsed += time.perf_counter() - start
+        if collided:
+            raise RuntimeError("benchmark path collided with itself")
+    return rate(ticks, elapsed)
+
+def bench_render_prep(snake, steering, ticks, config):
+    sampler = BodySampler(snake, config.body_sample_spacing)
+    sampler.update()
+    elapsed = 0.0
+    for i in range(ticks):
+        steering.steer(snake)
+        snake.update()
+        start = time.perf_counter()
+        sampler.update(0.5 if i % 2 else 1.0)
+        elapsed += time.perf_counter() - start
+    return rate(ticks, elapsed)
+
+def bench_food_spawn(snake, config, rounds, rejection_samples=FOOD_REJECTION_SAMPLES):
+    # rejection_samples=0 her yerleştirmeyi uzaklık alanı yoluna zorlar; boş arenada rastgele denemeler hep tutar
+    placer = FoodPlacer(config, rejection_samples=rejection_samples)
+    radius = config.food_radius
+    start = time.perf_counter()
+    for _ in range(rounds):
+        placer.place(snake, [], radius + config.food_spawn_buffer, radius * 3)
+    return rate(rounds, time.perf_counter() - start)
+
+def first_clear_point(placer, snake, food_positions, snake_clearance, food_clearance):
+    # Kenar boşluğu içindeki her tam sayı noktası sırayla sınanır. Uzaklıklar 1-Lipschitz olduğundan eksik kalan
+    # açıklık kadar ilerideki noktalar da uymaz ve atlanır; tarama yine de hiçbir adayı kaçırmaz.
+    runs = list(snake.runs)
+    (x_lo, x_hi), (y_lo, y_hi) = placer.x_range, placer.y_range
+    for x in range(x_lo, x_hi + 1):
+        y = y_lo
+        while y <= y_hi:
+            snake_dist = math.sqrt(min(run.distance_sq(x, y) for run in runs))
+            food_dist = min((math.hypot(x - f[0], y - f[1]) for f in food_positions), default=math.inf)
+            shortfall = max(snake_clearance - snake_dist, food_clearance - food_dist)
+            if shortfall <= 0 and placer.is_clear(snake, food_positions, x, y, snake_clearance, food_clearance):
+                return x, y
+            y += max(1, math.ceil(shortfall))
+    return None
+
+def check_food_placement(densities, seeds):
+    # Küçük bir arenada sürekli büyüyen yılanla yerleştirme denenir; her FoodPlacementError'da arena kaba kuvvetle
+    # taranır. Uygun nokta varken verilen her hata bir kaçırmadır.
+    calls, failures, misses = 0, 0, []
+    for density in densities:
+        for seed in range(seeds):
+            config = GameConfig(CHECK_ARENA, CHECK_ARENA, density=density)
+            game = Game(config, seed)
+            bot = WanderBot(config, random.Random(seed))
+            placer = FoodPlacer(config, random.Random(seed))
+            radius = config.food_radius
+            snake_clearance, food_clearance = radius + config.food_spawn_buffer, radius * 3
+            game.snake.growth_pending = CHECK_MAX_TICKS
+            while not game.over and game.tick < CHECK_MAX_TICKS:
+                direction = bot.choose(game)
+                if direction is not None:
+                    game.snake.change_direction(direction)
+                game.step()
+                if game.tick % CHECK_INTERVAL:
+                    continue
+                food_positions = [f.position for f in game.foods]
+                calls += 1
+                try:
+                    placer.place(game.snake, food_positions, snake_clearance, food_clearance)
+                except FoodPlacementError:
+                    failures += 1
+                    point = first_clear_point(placer, game.snake, food_positions, snake_clearance, food_clearance)
+                    if point is not None:
+                        misses.append((density, seed, game.tick, game.snake.length, point))
+    return calls, failures, misses
+
+def run(lengths, ticks, rounds, density):
+    results = {'movement': {}, 'collision': {}, 'food_spawn': {}, 'spawn_field': {}, 'render_prep': {}}
+    for length in lengths:
+        config = bench_config(length, ticks, density)
+        snake, steering = grow_snake(config, length)
+        results['movement'][str(length)] = bench_movement(snake, steering, ticks)
+        results['collision'][str(length)] = bench_collision(snake, steering, ticks)
+        results['render_prep'][str(length)] = bench_render_prep(snake, steering, ticks, config)
+        results['food_spawn'][str(length)] = bench_food_spawn(snake, config, rounds)
+        results['spawn_field'][str(length)] = bench_food_spawn(snake, config, rounds, rejection_samples=0)
+    return results
+
+def compare(results, baseline, tolerance):
+    # Taban çizgisinden `tolerance` oranından fazla yavaşlayan ölçümler
+    regressions = []
+    for name, by_length in baseline.items():
+        for length, expected in by_length.items():
+            measured = results.get(name, {}).get(length)
+            if measured is not None and measured < expected * (1 - tolerance):
+                regressions.append((name, length, expected, measured))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless snake engine benchmarks (ticks/sec).")
+    parser.add_argument('--lengths', type=int, nargs='+', default=list(BENCH_LENGTHS))
+    parser.add_argument('--ticks', type=int, default=BENCH_TICKS)
+    parser.add_argument('--spawn-rounds', type=int, default=SPAWN_ROUNDS)
+    parser.add_argument('--density', type=float, default=1.0)
+    parser.add_argument('--json', help="write results to this file")
+    parser.add_argument('--baseline', help="fail if slower than the results stored in this file")
+    parser.add_argument('--tolerance', type=float, default=0.25)
+    parser.add_argument('--check-placement', action='store_true',
+                        help="instead of timing, verify that food placement fails only when no spot is left")
+    args = parser.parse_args(argv)
+
+    if args.check_placement:
+        calls, failures, misses = check_food_placement(CHECK_DENSITIES, CHECK_SEEDS)
+        for density, seed, tick, length, point in misses:
+            print(f"MISSED density={density} seed={seed} tick={tick} length={length}: {point} is free", file=sys.stderr)
+        print(f"food placement: {calls} calls, {failures} failures, {len(misses)} missed")
+        return 1 if misses else 0
+
+    results = run(args.lengths, args.ticks, args.spawn_rounds, args.density)
+    print(f"{'benchmark':<12}" + "".join(f"{length:>14}" for length in args.lengths))
+    for name, by_length in results.items():
+        print(f"{name:<12}" + "".join(f"{by_length[str(length)]:>14.0f}" for length in args.lengths))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        for name, length, expected, measured in regressions:
+            print(f"REGRESSION {name} length={length}: {measured:.0f} < {expected:.0f} ticks/s", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
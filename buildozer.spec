@@ -27,6 +27,7 @@ source.include_exts = py,png,jpg,kv,atlas,wav,mp3
 # (list) List of exclusions using pattern matching
 # Do not prefix with './'
 #source.exclude_patterns = license,images/*/*.jpg
+source.exclude_patterns = bench.py, selfplay.py, tools/*, image.png, menu_image.png
 
 # (str) Application versioning (method 1)
 version = 0.1
@@ -44,10 +45,10 @@ requirements = python3,kivy,string,random
 # requirements.source.kivy = ../../kivy
 
 # (str) Presplash of the application
-presplash.filename = %(source.dir)s/menu_image.png
+presplash.filename = %(source.dir)s/assets/presplash.jpg
 
 # (str) Icon of the application
-icon.filename = %(source.dir)s/menu_image.png
+icon.filename = %(source.dir)s/assets/icon.png
 
 # (list) Supported orientations
 # Valid options are: landscape, portrait, portrait-reverse or landscape-reverse
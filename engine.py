@@ -0,0 +1,611 @@
+# Oyun kuralları: pencere, ses ya da Kivy olmadan adım adım çalıştırılabilir
+from collections import deque
+import random
+import math
+import time
+
+# --- Oyun Sabitleri (yarıçaplar yoğunluktan bağımsız birimlerde, dp) ---
+SNAKE_SPEED = 5
+SNAKE_HEAD_RADIUS = 18
+SNAKE_BODY_RADIUS = SNAKE_HEAD_RADIUS - 4
+SNAKE_COLLISION_THRESHOLD = SNAKE_SPEED
+SNAKE_INITIAL_LENGTH = 3
+FOOD_RADIUS = 12
+FOOD_SPAWN_BUFFER = 75
+FOOD_MARGIN = 30
+FOOD_REJECTION_SAMPLES = 8
+FOOD_CELL_SCALE = 2
+FOOD_PLACEMENT_ATTEMPTS = 64
+FOOD_SEARCH_LINES = 5
+DISTANCE_INF = 1e20
+GROWTH_PER_FOOD = 5
+NORMAL_FOOD_SCORE = 5
+POWERUP_FOOD_SCORE = 25
+POWERUP_SPAWN_CHANCE = 0.2
+POWERUP_DURATION_MS = 5000
+POWERUP_SPEED_MULTIPLIER = 1.5
+SIMULATION_HZ = 60
+SIMULATION_STEP = 1.0 / SIMULATION_HZ
+INPUT_QUEUE_SIZE = 3
+
+# --- Olaylar ---
+EVENT_EAT = 'eat'
+EVENT_POWER_UP = 'power_up'
+EVENT_POWER_UP_END = 'power_up_end'
+EVENT_GAME_OVER = 'game_over'
+
+class GameConfig:
+    # Piksel cinsinden oyun alanı ve kurallar; density, dp değerlerini piksele çevirir
+    def __init__(self, width, height, density=1.0, **overrides):
+        self.width = width
+        self.height = height
+        self.density = density
+        self.overrides = dict(overrides)
+        self.snake_speed = SNAKE_SPEED
+        self.head_radius = SNAKE_HEAD_RADIUS * density
+        self.body_radius = SNAKE_BODY_RADIUS * density
+        self.collision_threshold = SNAKE_COLLISION_THRESHOLD
+        self.initial_length = SNAKE_INITIAL_LENGTH
+        self.food_radius = FOOD_RADIUS * density
+        self.food_spawn_buffer = FOOD_SPAWN_BUFFER * density
+        self.food_margin = FOOD_MARGIN
+        self.growth_per_food = GROWTH_PER_FOOD
+        self.powerup_spawn_chance = POWERUP_SPAWN_CHANCE
+        self.powerup_duration_ticks = POWERUP_DURATION_MS * SIMULATION_HZ // 1000
+        self.powerup_speed_multiplier = POWERUP_SPEED_MULTIPLIER
+        for name, value in overrides.items():
+            if not hasattr(self, name):
+                raise TypeError(f"unknown game setting: {name}")
+            setattr(self, name, value)
+        self.cell_size = self.head_radius
+        self.body_sample_spacing = self.body_radius / 2
+
+class SpatialHash:
+    # Düzgün ızgara: her hücre (öğe, x, y) kayıtlarını tutar, sorgular yalnızca komşu hücrelere bakar
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+        self.cells = {}
+    def cell(self, x, y):
+        return int(x // self.cell_size), int(y // self.cell_size)
+    def insert(self, item, x, y):
+        key = self.cell(x, y)
+        bucket = self.cells.get(key)
+        if bucket is None:
+            self.cells[key] = bucket = []
+        bucket.append((item, x, y))
+    def remove(self, item, x, y):
+        key = self.cell(x, y)
+        bucket = self.cells[key]
+        for i, entry in enumerate(bucket):
+            if entry[0] == item:
+                del bucket[i]
+                break
+        if not bucket:
+            del self.cells[key]
+    def query(self, x, y, radius):
+        min_cx, min_cy = self.cell(x - radius, y - radius)
+        max_cx, max_cy = self.cell(x + radius, y + radius)
+        radius_sq = radius * radius
+        cells = self.cells
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is None:
+                    continue
+                for item, ix, iy in bucket:
+                    if (ix - x) ** 2 + (iy - y) ** 2 < radius_sq:
+                        yield item
+    def clear(self):
+        self.cells.clear()
+
+class PathGrid(SpatialHash):
+    # Yılan yolunun düz parçalarını (PathRun) üzerinden geçtikleri hücrelere kaydeder
+    def add(self, key, run):
+        bucket = self.cells.get(key)
+        if bucket is None:
+            self.cells[key] = bucket = []
+        bucket.append(run)
+    def discard(self, key, run):
+        bucket = self.cells[key]
+        for i, item in enumerate(bucket):
+            if item is run:
+                del bucket[i]
+                break
+        if not bucket:
+            del self.cells[key]
+    def runs_near(self, x, y, radius):
+        min_cx, min_cy = self.cell(x - radius, y - radius)
+        max_cx, max_cy = self.cell(x + radius, y + radius)
+        runs = {}
+        cells = self.cells
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                for run in cells.get((cx, cy), ()):
+                    runs[id(run)] = run
+        return runs.values()
+
+class PathRun:
+    # Aynı yön ve hızla atılmış ardışık adımlar: k. parça (k < count) baş ucundan k * step geridedir.
+    # odometer, baş ucunun yol üzerindeki toplam uzunluk konumudur.
+    __slots__ = ('x', 'y', 'dx', 'dy', 'step', 'count', 'odometer')
+    def __init__(self, x, y, dx, dy, step, count, odometer):
+        self.x, self.y = x, y
+        self.dx, self.dy = dx, dy
+        self.step = step
+        self.count = count
+        self.odometer = odometer
+    def tail_end(self):
+        back = (self.count - 1) * self.step
+        return self.x - self.dx * back, self.y - self.dy * back
+    def distance_sq(self, x, y, skip=0):
+        # (x, y) noktasının bu parçanın [skip, count) adımlarını kapsayan doğru parçasına kare uzaklığı
+        start = skip * self.step
+        end = (self.count - 1) * self.step
+        along = (self.x - x) * self.dx + (self.y - y) * self.dy
+        along = min(max(along, start), end)
+        px, py = self.x - self.dx * along, self.y - self.dy * along
+        return (px - x) ** 2 + (py - y) ** 2
+
+class Snake:
+    def __init__(self, config):
+        self.config = config
+        self.direction = [1, 0]
+        self.base_speed = config.snake_speed
+        self.speed = self.base_speed
+        self.growth_pending = 0
+        # Gövde, baştan kuyruğa düz parçaların (PathRun) listesidir; bellek yılanın boyuna değil dönüş sayısına bağlıdır
+        self.runs = deque()
+        self.index = PathGrid(config.cell_size)
+        self.generation = 0
+        self.reset()
+    def reset(self):
+        config = self.config
+        start_x = config.width / 2
+        start_y = config.height / 2
+        self.direction = [1, 0]
+        self.base_speed = config.snake_speed
+        self.speed = self.base_speed
+        self.growth_pending = 0
+        self.length = config.initial_length
+        self.odometer = (config.initial_length - 1) * config.snake_speed
+        self.prev_odometer = self.odometer
+        self.prev_tail_odometer = 0
+        self.head_pos = [start_x, start_y]
+        self.runs.clear()
+        self.index.clear()
+        run = PathRun(start_x, start_y, 1, 0, config.snake_speed, config.initial_length, self.odometer)
+        self.runs.append(run)
+        tail_cx, tail_cy = self.index.cell(*run.tail_end())
+        head_cx = self.index.cell(start_x, start_y)[0]
+        for cx in range(tail_cx, head_cx + 1):
+            self.index.add((cx, tail_cy), run)
+        # Çizim tarafı önbelleğini bu sayaç değişince baştan kurar
+        self.generation += 1
+    def update(self):
+        self.prev_odometer = self.odometer
+        self.prev_tail_odometer = self.tail_odometer()
+        dx, dy = self.direction
+        step = self.speed
+        old_key = self.index.cell(*self.head_pos)
+        self.head_pos = [self.head_pos[0] + dx * step, self.head_pos[1] + dy * step]
+        self.odometer += step
+        new_key = self.index.cell(*self.head_pos)
+        run = self.runs[0]
+        if run.dx == dx and run.dy == dy and run.step == step:
+            run.x, run.y = self.head_pos
+            run.count += 1
+            run.odometer = self.odometer
+            if new_key != old_key:
+                self.index.add(new_key, run)
+        else:
+            run = PathRun(self.head_pos[0], self.head_pos[1], dx, dy, step, 1, self.odometer)
+            self.runs.appendleft(run)
+            self.index.add(new_key, run)
+        self.length += 1
+        if self.growth_pending > 0:
+            self.growth_pending -= 1
+        else:
+            self.pop_tail()
+    def pop_tail(self):
+        run = self.runs[-1]
+        old_key = self.index.cell(*run.tail_end())
+        run.count -= 1
+        self.length -= 1
+        if run.count == 0:
+            self.runs.pop()
+            self.index.discard(old_key, run)
+        elif self.index.cell(*run.tail_end()) != old_key:
+            self.index.discard(old_key, run)
+    def tail_odometer(self):
+        run = self.runs[-1]
+        return run.odometer - (run.count - 1) * run.step
+    def odometer_of(self, i):
+        # i. parçanın (0 = baş) yol konumu
+        for run in self.runs:
+            if i < run.count:
+                return run.odometer - i * run.step
+            i -= run.count
+        raise IndexError(i)
+    def point_at(self, odometer):
+        # Yol üzerindeki verilen uzunluk konumunun koordinatı; dönüşler arası bağlantılar da parçaya dahildir.
+        # i. parça (runs[i+1].odometer, runs[i].odometer] aralığını kapsar; arama yakın olan uçtan başlar.
+        runs = self.runs
+        if odometer - self.tail_odometer() < self.odometer - odometer:
+            for run in reversed(runs):
+                if odometer <= run.odometer:
+                    break
+        else:
+            for i, run in enumerate(runs):
+                if i + 1 == len(runs) or odometer > runs[i + 1].odometer:
+                    break
+        back = run.odometer - odometer
+        return run.x - run.dx * back, run.y - run.dy * back
+    def apply_power_up(self):
+        self.speed = self.base_speed * self.config.powerup_speed_multiplier
+    def remove_power_up(self):
+        self.speed = self.base_speed
+    def change_direction(self, new_dir):
+        if self.length > 1 and new_dir[0] == -self.direction[0] and new_dir[1] == -self.direction[1]:
+            return
+        if new_dir[0] != 0 or new_dir[1] != 0:
+            self.direction = new_dir
+    def is_near(self, x, y, radius, skip=0):
+        # Baştan itibaren ilk `skip` parça hariç, gövdenin (x, y) noktasına `radius` mesafeden yakın olup olmadığı
+        skipped = {}
+        for run in self.runs:
+            if skip <= 0:
+                break
+            skipped[id(run)] = min(skip, run.count)
+            skip -= run.count
+        radius_sq = radius * radius
+        for run in self.index.runs_near(x, y, radius):
+            run_skip = skipped.get(id(run), 0)
+            if run_skip < run.count and run.distance_sq(x, y, run_skip) < radius_sq:
+                return True
+        return False
+    def check_collision(self):
+        config = self.config
+        head = self.head_pos
+        if not (config.head_radius < head[0] < config.width - config.head_radius and
+                config.head_radius < head[1] < config.height - config.head_radius):
+            return True
+        # Baş ve boyun kendisiyle çarpışma sayılmaz
+        return self.is_near(head[0], head[1], config.collision_threshold, skip=2)
+
+class BodySampler:
+    # Gövde dairelerini yol üzerinde sabit aralıklı (spacing katları) konumlarda örnekler. Çizim tarafı
+    # yalnızca update() sonucundaki farkı uygular: yılan ilerledikçe örnekler baştan eklenir, kuyruktan atılır.
+    def __init__(self, snake, spacing):
+        self.snake = snake
+        self.spacing = spacing
+        self.generation = None
+        self.first = 0
+        self.last = -1
+        self.head = self.neck = self.tail = None
+    def update(self, alpha=1.0):
+        # alpha: son iki simülasyon adımı arasındaki çizim ara değeri (0 = önceki durum, 1 = güncel durum).
+        # Dönüş: (kuyruk tarafından atılacak örnek sayısı, baş tarafına eklenecek [(m, x, y)] küçükten büyüğe)
+        snake = self.snake
+        lag = (1.0 - alpha) * (snake.odometer - snake.prev_odometer)
+        self.head = snake.point_at(snake.odometer - lag)
+        if snake.length < 2:
+            self.neck = self.tail = None
+            first, last = 0, -1
+        else:
+            neck_od = snake.odometer_of(1) - lag
+            tail_od = snake.tail_odometer()
+            tail_od -= (1.0 - alpha) * (tail_od - snake.prev_tail_odometer)
+            self.neck = snake.point_at(neck_od)
+            self.tail = snake.point_at(tail_od)
+            first = math.ceil(tail_od / self.spacing)
+            last = math.floor(neck_od / self.spacing)
+        dropped = 0
+        # Yılan sıfırlandıysa ya da aralık geriye kaydıysa tüm örnekler baştan kurulur
+        if self.generation != snake.generation or first < self.first or last < self.last:
+            dropped = self.last - self.first + 1
+            self.first, self.last = first, first - 1
+            self.generation = snake.generation
+        dropped += max(0, min(first, self.last + 1) - self.first)
+        start = max(first, self.last + 1)
+        added = []
+        for m in range(start, last + 1):
+            x, y = snake.point_at(m * self.spacing)
+            added.append((m, x, y))
+        self.first, self.last = first, max(last, first - 1)
+        return dropped, added
+
+class FoodPlacementError(RuntimeError):
+    pass
+
+def squared_distance_1d(f):
+    # Felzenszwalb-Huttenlocher: alt zarf (lower envelope) ile tek boyutlu kare uzaklık dönüşümü
+    n = len(f)
+    v = [0] * n
+    z = [0.0] * (n + 1)
+    z[0], z[1] = -DISTANCE_INF, DISTANCE_INF
+    k = 0
+    for q in range(1, n):
+        fq = f[q] + q * q
+        while True:
+            p = v[k]
+            s = (fq - f[p] - p * p) / (2 * (q - p))
+            if s > z[k]:
+                break
+            k -= 1
+        k += 1
+        v[k] = q
+        z[k] = s
+        z[k + 1] = DISTANCE_INF
+    out = [0.0] * n
+    k = 0
+    for q in range(n):
+        while z[k + 1] < q:
+            k += 1
+        p = v[k]
+        out[q] = (q - p) * (q - p) + f[p]
+    return out
+
+def search_points(lo, hi):
+    # [lo, hi] aralığında iki ucu da içeren, eşit aralıklı en çok FOOD_SEARCH_LINES tam sayı
+    n = FOOD_SEARCH_LINES - 1
+    return sorted({lo + (hi - lo) * i // n for i in range(n + 1)})
+
+class FoodPlacer:
+    # Önce arenadan düzgün dağılımlı birkaç nokta tam olarak sınanır; yılan kısayken ve arena boşken yerleştirme
+    # hemen biter. Hepsi reddedilirse arena, yılanın çarpışma ızgarasının FOOD_CELL_SCALE katı büyüklükte
+    # hücrelere bölünür ve dolu hücrelerden bir uzaklık alanı hesaplanır; bu yolun süresi yılanın uzunluğuna
+    # değil yalnızca arenanın hücre sayısına bağlıdır.
+    def __init__(self, config, rng=random, rejection_samples=FOOD_REJECTION_SAMPLES):
+        self.random = rng
+        self.rejection_samples = rejection_samples
+        width, height, margin = config.width, config.height, config.food_margin
+        self.scale = FOOD_CELL_SCALE
+        self.cell_size = cell_size = config.cell_size * FOOD_CELL_SCALE
+        self.cols = int(width // cell_size) + 1
+        self.rows = int(height // cell_size) + 1
+        self.slack = cell_size * math.sqrt(2)
+        self.x_range = (int(margin), int(width - margin))
+        self.y_range = (int(margin), int(height - margin))
+        # Kenar boşluğu içinde en az bir tam sayı noktası olan hücreler ve bu noktaların sınırları
+        self.cells = []
+        x_max, y_max = int(width - margin), int(height - margin)
+        for cx in range(self.cols):
+            x_lo, x_hi = max(margin, math.ceil(cx * cell_size)), min(x_max, math.ceil((cx + 1) * cell_size) - 1)
+            if x_lo > x_hi:
+                continue
+            for cy in range(self.rows):
+                y_lo, y_hi = max(margin, math.ceil(cy * cell_size)), min(y_max, math.ceil((cy + 1) * cell_size) - 1)
+                if y_lo <= y_hi:
+                    self.cells.append((cx, cy, x_lo, x_hi, y_lo, y_hi))
+    def is_clear(self, snake, food_positions, x, y, snake_clearance, food_clearance):
+        if snake.is_near(x, y, snake_clearance):
+            return False
+        return not any(math.hypot(x - f[0], y - f[1]) < food_clearance for f in food_positions)
+    def shortfall(self, snake, food_positions, x, y, snake_clearance, food_clearance):
+        # Noktanın gereken açıklığa ne kadar uzak kaldığı; 0 ya da altıysa nokta uygundur
+        nearest_sq = min((run.distance_sq(x, y) for run in snake.index.runs_near(x, y, snake_clearance)),
+                         default=snake_clearance * snake_clearance)
+        food_dist = min((math.hypot(x - f[0], y - f[1]) for f in food_positions), default=food_clearance)
+        return max(snake_clearance - math.sqrt(nearest_sq), food_clearance - food_dist)
+    def scan_line(self, snake, food_positions, snake_clearance, food_clearance, lo, hi, point):
+        # [lo, hi] boyunca ilk uygun konum ya da None; point(t) taranan çizginin t konumundaki noktasıdır
+        t = lo
+        while t <= hi:
+            x, y = point(t)
+            missing = self.shortfall(snake, food_positions, x, y, snake_clearance, food_clearance)
+            if missing <= 0 and self.is_clear(snake, food_positions, x, y, snake_clearance, food_clearance):
+                return t
+            t += max(1, math.ceil(missing))
+        return None
+    def snake_distance_field(self, occupied_cells):
+        # Her hücre merkezinin en yakın dolu hücre merkezine kare uzaklığı (hücre biriminde); dolu hücreler
+        # yılan ızgarasının anahtarlarıdır ve bu ızgaranın hücrelerine indirgenir
+        grid = [[DISTANCE_INF] * self.rows for _ in range(self.cols)]
+        scale = self.scale
+        for cx, cy in occupied_cells:
+            cx, cy = cx // scale, cy // scale
+            if 0 <= cx < self.cols and 0 <= cy < self.rows:
+                grid[cx][cy] = 0.0
+        grid = [squared_distance_1d(column) for column in grid]
+        for cy in range(self.rows):
+            row = squared_distance_1d([grid[cx][cy] for cx in range(self.cols)])
+            for cx in range(self.cols):
+                grid[cx][cy] = row[cx]
+        return grid
+    def food_blocked_cells(self, food_positions, food_clearance):
+        # Yalnızca yemeklerin çevresindeki hücreler: tamamen yasak (False) ya da sınırda (True)
+        size, half_slack = self.cell_size, self.slack / 2
+        reach = food_clearance + half_slack
+        blocked = {}
+        for fx, fy in food_positions:
+            for cx in range(max(0, int((fx - reach) // size)), min(self.cols - 1, int((fx + reach) // size)) + 1):
+                for cy in range(max(0, int((fy - reach) // size)), min(self.rows - 1, int((fy + reach) // size)) + 1):
+                    dist = math.hypot((cx + 0.5) * size - fx, (cy + 0.5) * size - fy)
+                    if dist + half_slack < food_clearance:
+                        blocked[cx, cy] = False
+                    elif dist - half_slack < food_clearance and blocked.get((cx, cy), True):
+                        blocked[cx, cy] = True
+        return blocked
+    def place(self, snake, food_positions, snake_clearance, food_clearance):
+        rng = self.random
+        for _ in range(self.rejection_samples):
+            x, y = rng.randint(*self.x_range), rng.randint(*self.y_range)
+            if self.is_clear(snake, food_positions, x, y, snake_clearance, food_clearance):
+                return [x, y]
+        field = self.snake_distance_field(snake.index.cells.keys())
+        food_blocked = self.food_blocked_cells(food_positions, food_clearance)
+        size, slack = self.cell_size, self.slack
+        free_limit, uncertain_limit = (snake_clearance + slack) / size, (snake_clearance - slack) / size
+        free_limit_sq = free_limit * free_limit
+        uncertain_limit_sq = uncertain_limit * uncertain_limit if uncertain_limit > 0 else -1.0
+        free, uncertain = [], []
+        for cell in self.cells:
+            snake_dist_sq = field[cell[0]][cell[1]]
+            if snake_dist_sq < uncertain_limit_sq:
+                continue
+            near_food = food_blocked.get((cell[0], cell[1]))
+            if near_food is False:
+                continue
+            if snake_dist_sq >= free_limit_sq and near_food is None:
+                free.append(cell)
+            else:
+                uncertain.append(cell)
+        if free:
+            _, _, x_lo, x_hi, y_lo, y_hi = rng.choice(free)
+            return [rng.randint(x_lo, x_hi), rng.randint(y_lo, y_hi)]
+        # Tamamen boş hücre kalmadıysa sınırdaki hücreler önce sınırlı sayıda rastgele denemeyle tam olarak sınanır
+        for _ in range(FOOD_PLACEMENT_ATTEMPTS if uncertain else 0):
+            _, _, x_lo, x_hi, y_lo, y_hi = rng.choice(uncertain)
+            x, y = rng.randint(x_lo, x_hi), rng.randint(y_lo, y_hi)
+            if self.is_clear(snake, food_positions, x, y, snake_clearance, food_clearance):
+                return [x, y]
+        # Kalan boşluk çoğunlukla bir köşe ya da kenar şerididir; rastgele noktalar onu kaçırabilir. Hücreler karışık
+        # sırayla, kenarlarını da içeren sabit bir ızgaranın yatay ve dikey çizgileri boyunca taranır. Uzaklıklar
+        # 1-Lipschitz olduğundan her adım eksik kalan açıklık kadar atlar ve çizgi üzerindeki hiçbir uygun nokta kaçmaz.
+        rng.shuffle(uncertain)
+        for _, _, x_lo, x_hi, y_lo, y_hi in uncertain:
+            for y in search_points(y_lo, y_hi):
+                x = self.scan_line(snake, food_positions, snake_clearance, food_clearance, x_lo, x_hi, lambda x: (x, y))
+                if x is not None:
+                    return [x, y]
+            for x in search_points(x_lo, x_hi):
+                y = self.scan_line(snake, food_positions, snake_clearance, food_clearance, y_lo, y_hi, lambda y: (x, y))
+                if y is not None:
+                    return [x, y]
+        raise FoodPlacementError("no free cell left for food")
+
+class Food:
+    score = 0
+    def __init__(self, config, placer, snake, all_food_positions):
+        self.radius = config.food_radius
+        self.position = placer.place(snake, all_food_positions, self.radius + config.food_spawn_buffer, self.radius * 3)
+
+class NormalFood(Food):
+    score = NORMAL_FOOD_SCORE
+
+class PowerUpFood(Food):
+    score = POWERUP_FOOD_SCORE
+    def __init__(self, config, placer, snake, all_food_positions):
+        super().__init__(config, placer, snake, all_food_positions)
+        self.effect = "speed_boost"
+
+class InputQueue:
+    # Adımlar arasında gelen dönüşler sırayla bekletilir ve her simülasyon adımında en çok biri uygulanır;
+    # böylece hızlı art arda iki dönüş birbirini ezmez. Ters yön denetimi, uygulanmamış olsa da en son
+    # sıraya giren yöne göre yapılır. Her girdi, gecikme ölçümü için geliş zamanıyla birlikte tutulur.
+    def __init__(self, size=INPUT_QUEUE_SIZE):
+        self.size = size
+        self.turns = deque()
+        self.dropped = 0
+    def push(self, direction, snake, timestamp=0.0):
+        last = self.turns[-1][0] if self.turns else snake.direction
+        if direction[0] == last[0] and direction[1] == last[1]:
+            return False
+        if snake.length > 1 and direction[0] == -last[0] and direction[1] == -last[1]:
+            return False
+        if len(self.turns) >= self.size:
+            self.dropped += 1
+            return False
+        self.turns.append((direction, timestamp))
+        return True
+    def pop(self):
+        return self.turns.popleft() if self.turns else None
+    def clear(self):
+        self.turns.clear()
+        self.dropped = 0
+
+class Game:
+    # Tek bir oyunun tüm kuralları; step() bir simülasyon adımı ilerletir ve olan olayları döndürür.
+    # Tüm rastgelelik oyunun kendi tohumlu üretecinden gelir: aynı tohum ve aynı girdiler aynı oyunu verir.
+    def __init__(self, config, seed=None):
+        self.config = config
+        self.random = random.Random()
+        self.snake = Snake(config)
+        self.placer = FoodPlacer(config, self.random)
+        self.food_index = SpatialHash(config.cell_size)
+        self.foods = []
+        # İsteğe bağlı FrameProfiler benzeri nesne (add(aşama, saniye)); None iken ölçüm yapılmaz
+        self.profiler = None
+        self.reset(seed)
+    def reset(self, seed=None):
+        self.seed = random.getrandbits(64) if seed is None else seed
+        self.random.seed(self.seed)
+        self.snake.reset()
+        self.score = 0
+        self.tick = 0
+        self.over = False
+        self.power_up_active = False
+        self.power_up_end_tick = 0
+        self.foods = []
+        self.food_index.clear()
+        self.spawn_food(NormalFood)
+    def spawn_food(self, food_class, food_positions=None):
+        if food_positions is None:
+            food_positions = [f.position for f in self.foods]
+        profiler = self.profiler
+        start = time.perf_counter() if profiler is not None else 0.0
+        try:
+            food = food_class(self.config, self.placer, self.snake, food_positions)
+        except FoodPlacementError:
+            return None
+        finally:
+            if profiler is not None:
+                profiler.add('food_spawn', time.perf_counter() - start)
+        self.foods.append(food)
+        self.food_index.insert(food, food.position[0], food.position[1])
+        return food
+    def remove_food(self, food):
+        self.foods.remove(food)
+        self.food_index.remove(food, food.position[0], food.position[1])
+    def power_up_remaining(self, alpha=1.0):
+        if not self.power_up_active:
+            return 0.0
+        return (self.power_up_end_tick - self.tick - alpha) / self.config.powerup_duration_ticks
+    def step(self):
+        events = []
+        if self.over:
+            return events
+        config = self.config
+        snake = self.snake
+        self.tick += 1
+        if self.power_up_active and self.power_up_end_tick < self.tick:
+            self.power_up_active = False
+            snake.remove_power_up()
+            events.append((EVENT_POWER_UP_END, None))
+
+        current_food_positions = [f.position for f in self.foods]
+        head = snake.head_pos
+        for food in list(self.food_index.query(head[0], head[1], config.head_radius)):
+            self.remove_food(food)
+            events.append((EVENT_EAT, food))
+            self.score += food.score
+            if isinstance(food, NormalFood):
+                snake.growth_pending += config.growth_per_food
+                if self.spawn_food(NormalFood, current_food_positions) is None:
+                    # Arenada yeni yem için yer kalmadı: oyun sona erer
+                    self.over = True
+                    events.append((EVENT_GAME_OVER, 'arena_full'))
+                    return events
+                if self.random.random() < config.powerup_spawn_chance:
+                    self.spawn_food(PowerUpFood, current_food_positions)
+            elif isinstance(food, PowerUpFood):
+                self.power_up_active = True
+                self.power_up_end_tick = self.tick + config.powerup_duration_ticks
+                snake.apply_power_up()
+                events.append((EVENT_POWER_UP, food))
+
+        profiler = self.profiler
+        if profiler is None:
+            snake.update()
+            collided = snake.check_collision()
+        else:
+            start = time.perf_counter()
+            snake.update()
+            moved = time.perf_counter()
+            collided = snake.check_collision()
+            profiler.add('move', moved - start)
+            profiler.add('collision', time.perf_counter() - moved)
+        if collided:
+            self.over = True
+            events.append((EVENT_GAME_OVER, 'collision'))
+        return events
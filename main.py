@@ -1,20 +1,35 @@
+import time
+STARTUP_START = time.perf_counter()
 from kivy.app import App
 from kivy.uix.widget import Widget
 from kivy.uix.button import Button
 from kivy.uix.label import Label
-from kivy.graphics import Color, Ellipse, Rectangle, Line
+from kivy.graphics import Color, Rectangle, Line, InstructionGroup, Mesh
 from kivy.core.window import Window
 from kivy.clock import Clock
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.floatlayout import FloatLayout
-from kivy.core.audio import SoundLoader
 from kivy.properties import NumericProperty, ListProperty, StringProperty, BooleanProperty
 from kivy.metrics import dp
 from kivy.core.text import Label as CoreLabel
 from kivy.graphics import PushMatrix, PopMatrix, Translate
-from kivy.core.image import Image as CoreImage
-import random
+from kivy.logger import Logger
+import os
+from collections import deque, OrderedDict
+from assets import AssetManager, StartupTimings, KIND_MUSIC, KIND_IMAGE, KIND_VOICES
+from mixer import Mixer
+from profiler import FrameProfiler
+from replay import ReplayRecorder
+from quality import QualityController
+from engine import (GameConfig, Game, InputQueue, PowerUpFood, BodySampler, SIMULATION_STEP,
+                    EVENT_EAT, EVENT_GAME_OVER)
 import math
+import json
+
+# --- Açılış Süreleri ---
+# Kivy içe aktarımı pencereyi de açtığı için ilk aşama pencere hazır olana kadar geçen süredir
+STARTUP = StartupTimings(STARTUP_START, report_after=('first_frame', 'assets_ready'))
+STARTUP.mark('kivy')
 
 # --- Ekran Ayarları ---
 Window.fullscreen = 'auto'
@@ -33,23 +48,35 @@ YELLOW = (243/255, 237/255, 76/255, 1)
 PURPLE = (181/255, 73/255, 241/255, 1)
 GRAY = (130/255, 130/255, 130/255, 1)
 HOVER_GRAY = (180/255, 180/255, 180/255, 1)
+SNAKE_COLORS = [GREEN, BLUE, YELLOW, PURPLE]
 
 # --- Oyun Sabitleri ---
-SNAKE_SPEED = 5
-SNAKE_HEAD_RADIUS = dp(18)
-SNAKE_BODY_RADIUS = SNAKE_HEAD_RADIUS - dp(4)
-SNAKE_COLLISION_THRESHOLD = SNAKE_SPEED
-SNAKE_INITIAL_LENGTH = 3
-FOOD_RADIUS = dp(12)
-FOOD_SPAWN_BUFFER = dp(75)
+GAME_CONFIG = GameConfig(GAME_AREA_RECT[2], GAME_AREA_RECT[3], density=dp(1))
+SNAKE_HEAD_RADIUS = GAME_CONFIG.head_radius
+SNAKE_BODY_RADIUS = GAME_CONFIG.body_radius
+FOOD_RADIUS = GAME_CONFIG.food_radius
+FOOD_RING_WIDTH = dp(2)
+MESH_CIRCLE_SEGMENTS = 16
+MESH_EDGE_CIRCLES = 256
+MESH_MAX_VERTICES = 65536  # Kivy Mesh indeksleri 16 bittir
+BACKGROUND_TILE_SIZE = dp(340)
+BACKGROUND_VARIANTS = (256, 512, 1024)
+BACKGROUND_SOURCE = 'image.png'
 TOUCH_SENSITIVITY = dp(40)
 HIGHSCORE_FILE = "snake_highscore.txt"
-GROWTH_PER_FOOD = 5
-POWERUP_SPAWN_CHANCE = 0.2
-POWERUP_DURATION_MS = 5000
-POWERUP_SPEED_MULTIPLIER = 1.5
+TEXT_CACHE_SIZE = 64
+MAX_STEPS_PER_FRAME = 8
 POWERUP_BAR_WIDTH = dp(150)
 POWERUP_BAR_HEIGHT = dp(15)
+PROFILE_HUD_INTERVAL = 0.5
+PROFILE_FONT_SIZE = 12
+PROFILE_TOGGLE_KEY = 290  # F9
+PROFILE_EXPORT_KEY = 291  # F10
+REPLAY_DIR = "replays"
+REPLAY_KEEP = 20
+INPUT_LATENCY_SAMPLES = 256
+QUALITY_LOG_FILE = "quality-log.jsonl"
+EFFECT_VOICES = {'eat': 3, 'powerup': 2, 'game_over': 1}
 
 # --- Fontlar ---
 try:
@@ -58,27 +85,33 @@ try:
     FONT_NAME = 'Retro'
 except FileNotFoundError:
     FONT_NAME = 'Roboto'  # Varsayılan Kivy fontu
+STARTUP.mark('fonts')
 
-# --- Ses Dosyaları ---
-try:
-    BACKGROUND_MUSIC = SoundLoader.load('background_music.mp3')
-    EAT_SOUND = SoundLoader.load('eat_sound.wav')
-    GAME_OVER_SOUND = SoundLoader.load('game_over_sound.wav')
-    SOUNDS_LOADED = True
-except Exception:
-    SOUNDS_LOADED = False
+# --- Ses ve Dokular ---
+# Yükleme SnakeApp.build içinde başlar; oyun kodu varlıkları ASSETS üzerinden, hazır olduklarında kullanır
+ASSETS = AssetManager(STARTUP)
+MIXER = Mixer()
 
 # --- Ayarlar ---
-settings = {'fps': 60, 'snake_color': GREEN}
+# Profilleyici SNAKE_PROFILE=1 ortam değişkeniyle açık başlar, oyun sırasında F9 ile açılıp kapanır
+# Uyarlamalı kalite varsayılan olarak açıktır; SNAKE_QUALITY=fixed en yüksek seviyede sabitler
+settings = {'fps': 60, 'snake_color': GREEN, 'profile': os.environ.get('SNAKE_PROFILE') == '1',
+            'auto_quality': os.environ.get('SNAKE_QUALITY') != 'fixed'}
 
 # --- Sınıflar ---
 class ButtonWidget(Button):
     def __init__(self, text, color, hover_color, **kwargs):
         super().__init__(text=text, font_name=FONT_NAME, **kwargs)
         self.background_normal = ''
+        # Button.color yazı rengidir; dokunuş bitince dönülecek arka plan rengi ayrı tutulur
+        self.base_color = color
         self.background_color = color
         self.hover_color = hover_color
         self.is_hovered = False
+    def set_base_color(self, color):
+        self.base_color = color
+        if not self.is_hovered:
+            self.background_color = color
     def on_touch_down(self, touch):
         if self.collide_point(*touch.pos):
             self.is_hovered = True
@@ -86,120 +119,239 @@ class ButtonWidget(Button):
             return super().on_touch_down(touch)
     def on_touch_move(self, touch):
         self.is_hovered = self.collide_point(*touch.pos)
-        self.background_color = self.hover_color if self.is_hovered else self.color
+        self.background_color = self.hover_color if self.is_hovered else self.base_color
         return super().on_touch_move(touch)
     def on_touch_up(self, touch):
         if self.collide_point(*touch.pos) and self.is_hovered:
-            self.background_color = self.color
+            self.background_color = self.base_color
             self.is_hovered = False
             return super().on_touch_up(touch)
-        self.background_color = self.color
+        self.background_color = self.base_color
         self.is_hovered = False
         return super().on_touch_up(touch)
 
-class Snake:
-    def __init__(self):
-        self.segments = []
-        self.direction = [1, 0]
-        self.base_speed = SNAKE_SPEED
-        self.speed = self.base_speed
-        self.growth_pending = 0
-        self.graphics = []
-        self.reset()
-    def reset(self):
-        start_x = GAME_AREA_RECT[2] / 2
-        start_y = GAME_AREA_RECT[3] / 2
-        self.segments = [[start_x - i * SNAKE_SPEED, start_y] for i in range(SNAKE_INITIAL_LENGTH)]
-        self.direction = [1, 0]
-        self.base_speed = SNAKE_SPEED
-        self.speed = self.base_speed
-        self.growth_pending = 0
-        self.graphics = []
-    def update(self):
-        new_head = [self.segments[0][0] + self.direction[0] * self.speed,
-                    self.segments[0][1] + self.direction[1] * self.speed]
-        self.segments.insert(0, new_head)
-        if self.growth_pending > 0:
-            self.growth_pending -= 1
+class TextTextureCache:
+    # (metin, font, boyut, renk) anahtarlı, sınırlı boyutlu LRU doku önbelleği
+    def __init__(self, max_size=TEXT_CACHE_SIZE):
+        self.max_size = max_size
+        self.textures = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+    def get(self, text, font, size, color):
+        key = (text, font, size, tuple(color))
+        texture = self.textures.get(key)
+        if texture is not None:
+            self.hits += 1
+            self.textures.move_to_end(key)
+            return texture
+        self.misses += 1
+        label = CoreLabel(text=text, font_name=font, font_size=dp(size), color=color)
+        label.refresh()
+        texture = label.texture
+        self.textures[key] = texture
+        if len(self.textures) > self.max_size:
+            self.textures.popitem(last=False)
+        return texture
+    def clear(self):
+        self.textures.clear()
+
+def circle_shape(radius, segments=MESH_CIRCLE_SEGMENTS):
+    # Merkez + çember köşeleri ve üçgen yelpazesi; her daire bu şablonun ötelenmiş kopyasıdır
+    offsets = [(0.0, 0.0)] + [(radius * math.cos(2 * math.pi * k / segments), radius * math.sin(2 * math.pi * k / segments))
+                              for k in range(segments)]
+    indices = []
+    for k in range(segments):
+        indices += (0, 1 + k, 1 + (k + 1) % segments)
+    return offsets, indices
+
+def ring_shape(inner, outer, segments=MESH_CIRCLE_SEGMENTS):
+    angles = [2 * math.pi * k / segments for k in range(segments)]
+    offsets = ([(inner * math.cos(a), inner * math.sin(a)) for a in angles] +
+               [(outer * math.cos(a), outer * math.sin(a)) for a in angles])
+    indices = []
+    for k in range(segments):
+        n = (k + 1) % segments
+        indices += (k, segments + k, segments + n, k, segments + n, n)
+    return offsets, indices
+
+class MeshBatch:
+    # Aynı renkteki şekilleri tek bir Mesh'te toplar: kaç şekil olursa olsun tek çizim çağrısı.
+    # Şekiller ekleme sırasıyla tutulur; en eskiler baştan atılır.
+    def __init__(self, shape):
+        self.offsets, self.shape_indices = shape
+        self.stride = 4 * len(self.offsets)
+        self.vertices = []
+        self.indices = []
+        self.count = 0
+        self.dirty = False
+        self.mesh = Mesh(mode='triangles')
+    def append(self, x, y):
+        vertices = self.vertices
+        for ox, oy in self.offsets:
+            vertices += (x + ox, y + oy, 0.0, 0.0)
+        self.count += 1
+        self.dirty = True
+    def extend(self, vertices, count):
+        self.vertices += vertices
+        self.count += count
+        self.dirty = True
+    def drop_oldest(self, n):
+        del self.vertices[:n * self.stride]
+        self.count -= n
+        self.dirty = True
+    def take_oldest(self, n):
+        vertices = self.vertices[:n * self.stride]
+        self.drop_oldest(n)
+        return vertices
+    def clear(self):
+        self.vertices = []
+        self.count = 0
+        self.dirty = True
+    def flush(self):
+        if not self.dirty:
+            return
+        # İndeks listesi yalnızca büyür; her karede yeniden kurulmaz
+        needed = self.count * len(self.shape_indices)
+        base = len(self.indices) // len(self.shape_indices) * len(self.offsets)
+        while len(self.indices) < needed:
+            self.indices += [base + i for i in self.shape_indices]
+            base += len(self.offsets)
+        self.mesh.vertices = self.vertices
+        self.mesh.indices = self.indices[:needed]
+        self.dirty = False
+
+def background_image_path():
+    # tools/build_assets.py çıktısından, ekrandaki döşeme boyutunu karşılayan en küçük sürüm seçilir; döşeme
+    # en büyük sürümden de büyükse en büyüğü büyütülerek kullanılır. Kaynak image.png APK'ya girmediği için
+    # yalnızca assets/ üretilmemiş bir geliştirme kopyasında kullanılır. Hiçbiri yoksa arka plan çizilmez.
+    largest = None
+    for size in BACKGROUND_VARIANTS:
+        path = os.path.join('assets', f'background-{size}.jpg')
+        if os.path.exists(path):
+            if size >= BACKGROUND_TILE_SIZE:
+                return path
+            largest = path
+    if largest is None and os.path.exists(BACKGROUND_SOURCE):
+        return BACKGROUND_SOURCE
+    return largest
+
+def count_instructions(group):
+    # Profilleyici için: iç içe gruplar dahil kanvastaki toplam çizim komutu sayısı
+    total = 0
+    for child in group.children:
+        total += 1
+        if isinstance(child, InstructionGroup):
+            total += count_instructions(child)
+    return total
+
+class SnakeRenderer:
+    # Kivy bir Mesh değişince tüm tamponunu yeniden yükler. Bu yüzden gövdenin her karede değişen iki ucu
+    # MESH_EDGE_CIRCLES dairelik küçük parçalardadır: baş tarafına daire eklenir, kuyruk tarafından atılır. Arada
+    # kalan gövde, 16 bitlik indeks sınırına sığan en büyük parçalarda durur ve dokunulmaz. Baş parçası dolunca
+    # en yeni büyük parçaya aktarılır, kuyruk parçası boşalınca en eski büyük parçadan doldurulur. Böylece büyük
+    # bir parça ancak MESH_EDGE_CIRCLES karede bir yüklenir ve gövde 2 + daire sayısı / bulk_circles çizim
+    # çağrısıyla çizilir.
+    def __init__(self, snake, segments=MESH_CIRCLE_SEGMENTS, spacing=GAME_CONFIG.body_sample_spacing):
+        self.sampler = BodySampler(snake, spacing)
+        self.graphics = InstructionGroup()
+        self.body_shape = circle_shape(SNAKE_BODY_RADIUS, segments)
+        self.head_color = Color(*BLACK)
+        self.head = MeshBatch(circle_shape(SNAKE_HEAD_RADIUS, segments))
+        self.body_color = Color(*BLACK)
+        self.ends = MeshBatch(self.body_shape)
+        self.front = MeshBatch(self.body_shape)
+        self.back = MeshBatch(self.body_shape)
+        self.bulk = deque()
+        self.bulk_circles = MESH_MAX_VERTICES // len(self.body_shape[0])
+        self.spare_chunks = []
+        self.color = None
+        for instruction in (self.head_color, self.head.mesh, self.body_color, self.ends.mesh,
+                            self.front.mesh, self.back.mesh):
+            self.graphics.add(instruction)
+    def draw(self, color, alpha=1.0):
+        if color != self.color:
+            self.color = color
+            self.head_color.rgba = (max(0, color[0] - 0.2), max(0, color[1] - 0.2), max(0, color[2] - 0.2), 1)
+            self.body_color.rgba = color
+        sampler = self.sampler
+        dropped, added = sampler.update(alpha)
+        self.head.clear()
+        self.head.append(sampler.head[0], sampler.head[1] + UI_HEIGHT)
+        self.head.flush()
+        self.ends.clear()
+        if sampler.neck is not None:
+            self.ends.append(sampler.neck[0], sampler.neck[1] + UI_HEIGHT)
+            self.ends.append(sampler.tail[0], sampler.tail[1] + UI_HEIGHT)
+        self.ends.flush()
+        self.drop(dropped)
+        front = self.front
+        for _, x, y in added:
+            if front.count == MESH_EDGE_CIRCLES:
+                self.spill_front()
+            front.append(x, y + UI_HEIGHT)
+        front.flush()
+        self.back.flush()
+        for chunk in self.bulk:
+            chunk.flush()
+    def drop(self, n):
+        # Daireler eskiden yeniye: kuyruk parçası, büyük parçalar (sondan başa), baş parçası
+        back = self.back
+        while n:
+            if back.count == 0:
+                if not self.bulk:
+                    # Kısa yılan: kalan gövdenin tamamı baş parçasındadır
+                    self.front.drop_oldest(n)
+                    return
+                self.refill_back()
+            k = min(n, back.count)
+            back.drop_oldest(k)
+            n -= k
+    def refill_back(self):
+        chunk = self.bulk[-1]
+        k = min(MESH_EDGE_CIRCLES, chunk.count)
+        self.back.extend(chunk.take_oldest(k), k)
+        if chunk.count == 0:
+            self.bulk.pop()
+            self.graphics.remove(chunk.mesh)
+            self.spare_chunks.append(chunk)
+    def spill_front(self):
+        front = self.front
+        if self.bulk and self.bulk[0].count + front.count <= self.bulk_circles:
+            chunk = self.bulk[0]
         else:
-            self.segments.pop()
-    def apply_power_up(self):
-        self.speed = self.base_speed * POWERUP_SPEED_MULTIPLIER
-    def remove_power_up(self):
-        self.speed = self.base_speed
-    def draw(self, canvas, color):
-        darker_head_color = (max(0, color[0] - 0.2), max(0, color[1] - 0.2), max(0, color[2] - 0.2), 1)
-        self.graphics = []
-        with canvas:
-            for i, segment in enumerate(self.segments):
-                pos = (segment[0], segment[1] + UI_HEIGHT)
-                if i == 0:
-                    Color(*darker_head_color)
-                    self.graphics.append(Ellipse(pos=(pos[0] - SNAKE_HEAD_RADIUS, pos[1] - SNAKE_HEAD_RADIUS),
-                                                size=(SNAKE_HEAD_RADIUS * 2, SNAKE_HEAD_RADIUS * 2)))
-                else:
-                    Color(*color)
-                    self.graphics.append(Ellipse(pos=(pos[0] - SNAKE_BODY_RADIUS, pos[1] - SNAKE_BODY_RADIUS),
-                                                size=(SNAKE_BODY_RADIUS * 2, SNAKE_BODY_RADIUS * 2)))
-    def change_direction(self, new_dir):
-        if len(self.segments) > 1 and new_dir[0] == -self.direction[0] and new_dir[1] == -self.direction[1]:
+            chunk = self.spare_chunks.pop() if self.spare_chunks else MeshBatch(self.body_shape)
+            chunk.clear()
+            self.bulk.appendleft(chunk)
+            self.graphics.add(chunk.mesh)
+        chunk.extend(front.vertices, front.count)
+        front.clear()
+
+class FoodRenderer:
+    # Tüm yemekler türlerine göre üç Mesh'te çizilir; yalnızca yemek eklenip yenince yeniden kurulur
+    def __init__(self, segments=MESH_CIRCLE_SEGMENTS):
+        self.graphics = InstructionGroup()
+        self.normal = MeshBatch(circle_shape(FOOD_RADIUS, segments))
+        self.power_up = MeshBatch(circle_shape(FOOD_RADIUS, segments))
+        self.power_up_ring = MeshBatch(ring_shape(FOOD_RADIUS - FOOD_RING_WIDTH, FOOD_RADIUS, segments))
+        self.foods = []
+        for instruction in (Color(*RED), self.normal.mesh, Color(*BLUE), self.power_up.mesh,
+                            Color(*WHITE), self.power_up_ring.mesh):
+            self.graphics.add(instruction)
+    def sync(self, foods):
+        if foods == self.foods:
             return
-        if new_dir[0] != 0 or new_dir[1] != 0:
-            self.direction = new_dir
-    def check_collision(self):
-        head = self.segments[0]
-        if not (SNAKE_HEAD_RADIUS < head[0] < GAME_AREA_RECT[2] - SNAKE_HEAD_RADIUS and
-                SNAKE_HEAD_RADIUS < head[1] < GAME_AREA_RECT[3] - SNAKE_HEAD_RADIUS):
-            return True
-        if len(self.segments) > 2:
-            for segment in self.segments[2:]:
-                dist = math.hypot(head[0] - segment[0], head[1] - segment[1])
-                if dist < SNAKE_COLLISION_THRESHOLD:
-                    return True
-        return False
-
-class Food:
-    def __init__(self, all_snake_segments, all_food_positions):
-        self.radius = FOOD_RADIUS
-        self.position = self.randomize_position(all_snake_segments, all_food_positions)
-        self.graphics = []
-    def randomize_position(self, all_snake_segments, all_food_positions):
-        margin = 30
-        while True:
-            new_pos = [random.randint(margin, GAME_AREA_RECT[2] - margin),
-                       random.randint(margin, GAME_AREA_RECT[3] - margin)]
-            is_too_close_to_snake = any(math.hypot(new_pos[0] - s[0], new_pos[1] - s[1]) < self.radius + FOOD_SPAWN_BUFFER
-                                        for s in all_snake_segments)
-            is_too_close_to_food = any(math.hypot(new_pos[0] - f[0], new_pos[1] - f[1]) < self.radius * 3
-                                       for f in all_food_positions)
-            if not is_too_close_to_snake and not is_too_close_to_food:
-                return new_pos
-    def draw(self, canvas):
-        raise NotImplementedError
-
-class NormalFood(Food):
-    def draw(self, canvas):
-        self.graphics = []
-        with canvas:
-            Color(*RED)
-            pos = (self.position[0], self.position[1] + UI_HEIGHT)
-            self.graphics.append(Ellipse(pos=(pos[0] - self.radius, pos[1] - self.radius),
-                                        size=(self.radius * 2, self.radius * 2)))
-
-class PowerUpFood(Food):
-    def __init__(self, all_snake_segments, all_food_positions):
-        super().__init__(all_snake_segments, all_food_positions)
-        self.effect = "speed_boost"
-    def draw(self, canvas):
-        self.graphics = []
-        with canvas:
-            Color(*BLUE)
-            pos = (self.position[0], self.position[1] + UI_HEIGHT)
-            self.graphics.append(Ellipse(pos=(pos[0] - self.radius, pos[1] - self.radius),
-                                        size=(self.radius * 2, self.radius * 2)))
-            Color(*WHITE)
-            self.graphics.append(Ellipse(pos=(pos[0] - self.radius, pos[1] - self.radius),
-                                        size=(self.radius * 2, self.radius * 2), segments=16, linewidth=2))
+        self.foods = list(foods)
+        for batch in (self.normal, self.power_up, self.power_up_ring):
+            batch.clear()
+        for food in foods:
+            x, y = food.position[0], food.position[1] + UI_HEIGHT
+            if isinstance(food, PowerUpFood):
+                self.power_up.append(x, y)
+                self.power_up_ring.append(x, y)
+            else:
+                self.normal.append(x, y)
+        for batch in (self.normal, self.power_up, self.power_up_ring):
+            batch.flush()
 
 class GameWidget(Widget):
     score = NumericProperty(0)
@@ -211,35 +363,163 @@ class GameWidget(Widget):
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        self.snake = Snake()
-        self.foods = [NormalFood(self.snake.segments, [])]
+        self.text_cache = TextTextureCache()
+        # set_text sahne kurulurken de profilleyiciye bakar
+        self.profiler = None
+        self.build_scene()
+        self.game = Game(GAME_CONFIG)
+        self.snake = self.game.snake
+        self.quality = QualityController()
+        self.build_renderers()
         try:
             with open(HIGHSCORE_FILE, "r") as f:
                 self.high_score = int(f.read())
         except (FileNotFoundError, ValueError):
             self.high_score = 0
-        self.power_up_end_time = 0
-        self.touch_start_pos = None
+        self.accumulator = 0.0
+        self.update_time = 0.0
+        self.submit_time = 0.0
+        self.draw_start = time.perf_counter()
+        Window.bind(on_draw=self.on_window_draw, on_flip=self.on_window_flip)
+        self.profile_hud_elapsed = 0.0
+        self.recorder = None
+        self.input_queue = InputQueue()
+        self.applied_turns = []
+        self.input_latencies = deque(maxlen=INPUT_LATENCY_SAMPLES)
         self.menu_buttons = []
         self.settings_fps_buttons = []
         self.color_buttons = []
         self.setup_ui()
-        self.background = self.create_tiled_background('image.png', GAME_AREA_RECT[2], GAME_AREA_RECT[3])
-        Clock.schedule_interval(self.update, 1.0 / settings['fps'])
+        self.background = None
+        self.background_shown = False
+        self.create_tiled_background(GAME_AREA_RECT[2], GAME_AREA_RECT[3])
+        self.build_overlays()
+        self.show_overlay(self.game_state)
+        # Simülasyon saati yalnızca oyun sürerken çalışır; diğer ekranlar değişiklik olduğunda bir kez çizilir
+        self.sim_event = None
+        self.redraw_trigger = Clock.create_trigger(self.redraw)
+        self.redraw_trigger()
+        Clock.schedule_once(self.on_first_frame)
+        if settings['profile']:
+            self.enable_profiler()
+
+    def on_first_frame(self, dt):
+        STARTUP.mark('first_frame')
+
+    def build_scene(self):
+        # Sahne katmanları bir kez kurulur ve her karede yerinde güncellenir
+        self.snake_layer = InstructionGroup()
+        self.food_layer = InstructionGroup()
+        self.hud_layer = InstructionGroup()
+        self.overlay_layer = InstructionGroup()
+        self.profile_layer = InstructionGroup()
+        for layer in (self.snake_layer, self.food_layer, self.hud_layer, self.overlay_layer, self.profile_layer):
+            self.canvas.add(layer)
+
+        self.hud_layer.add(Color(*BLACK))
+        self.hud_layer.add(Rectangle(pos=(0, 0), size=(SCREEN_WIDTH, UI_HEIGHT)))
+        self.hud_layer.add(Color(*WHITE))
+        self.hud_layer.add(Line(points=[0, UI_HEIGHT, SCREEN_WIDTH, UI_HEIGHT], width=2))
+        self.score_label = self.draw_text(self.hud_layer, f"SKOR: {self.score}", FONT_NAME, 15, 20, UI_HEIGHT/2, WHITE)
+        self.high_score_label = self.draw_text(self.hud_layer, f"YUKSEK SKOR: {self.high_score}", FONT_NAME, 15,
+                                               SCREEN_WIDTH - 280, UI_HEIGHT/2, WHITE)
+
+        bar_x = SCREEN_WIDTH - POWERUP_BAR_WIDTH - 20
+        bar_y = 10
+        self.power_up_bar = InstructionGroup()
+        self.power_up_bar.add(Color(*GRAY))
+        self.power_up_bar.add(Rectangle(pos=(bar_x, bar_y), size=(POWERUP_BAR_WIDTH, POWERUP_BAR_HEIGHT)))
+        self.power_up_bar.add(Color(*YELLOW))
+        self.power_up_fill = Rectangle(pos=(bar_x, bar_y), size=(POWERUP_BAR_WIDTH, POWERUP_BAR_HEIGHT))
+        self.power_up_bar.add(self.power_up_fill)
+        self.draw_text(self.power_up_bar, "HIZLI!", FONT_NAME, 15, bar_x - 50, bar_y + 8, YELLOW)
+
+    def build_overlays(self):
+        main_menu = InstructionGroup()
+        self.draw_text(main_menu, "RETRO YILAN", FONT_NAME, 35, SCREEN_WIDTH/2, SCREEN_HEIGHT*0.15, WHITE)
+
+        settings_overlay = InstructionGroup()
+        self.draw_text(settings_overlay, "AYARLAR", FONT_NAME, 30, SCREEN_WIDTH/2, SCREEN_HEIGHT*0.1, WHITE)
+        self.draw_text(settings_overlay, "Oyun Hizi (FPS)", FONT_NAME, 20, SCREEN_WIDTH/2, SCREEN_HEIGHT*0.28, WHITE)
+        self.draw_text(settings_overlay, "Yilan Rengi", FONT_NAME, 20, SCREEN_WIDTH/2, SCREEN_HEIGHT*0.58, WHITE)
+        settings_overlay.add(Color(*WHITE))
+        self.color_marker = Line(rectangle=(0, 0, 0, 0), width=3)
+        settings_overlay.add(self.color_marker)
+
+        game_over = InstructionGroup()
+        game_over.add(Color(0, 0, 0, 0.7))
+        game_over.add(Rectangle(pos=(0, 0), size=(SCREEN_WIDTH, SCREEN_HEIGHT)))
+        self.draw_text(game_over, "OYUN BITTI", FONT_NAME, 30, SCREEN_WIDTH/2, SCREEN_HEIGHT/3, RED)
+        self.final_score_label = self.draw_text(game_over, f"SKORUNUZ: {self.score}", FONT_NAME, 20,
+                                                SCREEN_WIDTH/2, SCREEN_HEIGHT/2, WHITE)
+        self.new_high_score_banner = InstructionGroup()
+        self.draw_text(self.new_high_score_banner, "YENI YUKSEK SKOR!", FONT_NAME, 20,
+                       SCREEN_WIDTH/2, SCREEN_HEIGHT/2 + 50, YELLOW)
+        self.new_high_score_slot = InstructionGroup()
+        game_over.add(self.new_high_score_slot)
+        self.draw_text(game_over, "Ana Menu Icin Dokun", FONT_NAME, 15, SCREEN_WIDTH/2, SCREEN_HEIGHT*0.75, WHITE)
+
+        self.overlays = {'main_menu': main_menu, 'settings': settings_overlay, 'game_over': game_over}
+        self.update_color_marker()
+
+    def create_tiled_background(self, width, height):
+        # Doku yüklenene kadar alan siyah kalır
+        with self.canvas.before:
+            Color(*BLACK)
+            Rectangle(pos=(0, UI_HEIGHT), size=(width, height))
+        ASSETS.when_ready('background', lambda tile: self.apply_background(tile, width, height))
 
-    def create_tiled_background(self, image_path, width, height):
+    def apply_background(self, tile, width, height):
+        # Tek dörtgen: doku 'repeat' sarmalıyla BACKGROUND_TILE_SIZE aralıklarla tekrarlanır
+        tile.wrap = 'repeat'
+        repeat_x, repeat_y = width / BACKGROUND_TILE_SIZE, height / BACKGROUND_TILE_SIZE
+        # Resimden yüklenen dokular dikeyde ters çevrilmiştir (uvsize[1] < 0); yön korunur
+        tile.uvsize = (repeat_x, -repeat_y if tile.uvsize[1] < 0 else repeat_y)
+        with self.canvas.before:
+            Color(*WHITE)
+            self.background = Rectangle(texture=tile, pos=(0, UI_HEIGHT), size=(width, height))
+        self.background_shown = True
+        self.set_background_visible(self.quality.current.background)
+
+    def set_background_visible(self, visible):
+        # Gizli arka plan saydam çizilmez, kanvastan çıkarılır; böylece doldurma maliyeti de kalkar
+        if self.background is None or visible == self.background_shown:
+            return
+        if visible:
+            self.canvas.before.add(self.background)
+        else:
+            self.canvas.before.remove(self.background)
+        self.background_shown = visible
+
+    def build_renderers(self):
+        # Kalite seviyesi değiştiğinde çizim nesneleri yeni daire kenar sayısı ve örnek aralığıyla baştan kurulur
+        level = self.quality.current
+        self.snake_layer.clear()
+        self.food_layer.clear()
+        self.snake_renderer = SnakeRenderer(self.snake, level.segments, GAME_CONFIG.body_sample_spacing * level.spacing)
+        self.snake_layer.add(self.snake_renderer.graphics)
+        self.food_renderer = FoodRenderer(level.segments)
+        self.food_layer.add(self.food_renderer.graphics)
+        self.sync_foods()
+
+    def apply_quality(self, level):
+        self.build_renderers()
+        # Yeni çizim nesneleri boş başlar; bir kare yılansız kalmaması için hemen çizilir
+        self.snake_renderer.draw(settings['snake_color'], self.accumulator / SIMULATION_STEP)
+        self.set_background_visible(level.background)
+        if self.sim_event is not None:
+            self.stop_clock()
+            self.start_clock()
+        if self.profiler is not None:
+            self.profiler.target_frame = self.frame_interval()
+        decision = dict(self.quality.decisions[-1], segments=self.snake.length, score=self.score)
+        Logger.info(f"Quality: {decision['from']} -> {decision['to']} (frame p90 {decision['frame_p90_ms']:.1f}ms, "
+                    f"busy p90 {decision['busy_p90_ms']:.1f}ms, target {decision['target_ms']:.1f}ms)")
         try:
-            tile = CoreImage(image_path).texture
-            with self.canvas.before:
-                Color(*BLACK)
-                Rectangle(pos=(0, UI_HEIGHT), size=(width, height))
-                for x in range(0, int(width), tile.width):
-                    for y in range(0, int(height), tile.height):
-                        Rectangle(texture=tile, pos=(x, y + UI_HEIGHT), size=(tile.width, tile.height))
-        except Exception:
-            with self.canvas.before:
-                Color(*BLACK)
-                Rectangle(pos=(0, UI_HEIGHT), size=(width, height))
+            with open(os.path.join(App.get_running_app().user_data_dir, QUALITY_LOG_FILE), "a") as f:
+                f.write(json.dumps(decision) + "\n")
+        except OSError:
+            pass
 
     def setup_ui(self):
         self.menu_buttons = [
@@ -253,7 +533,7 @@ class GameWidget(Widget):
             ButtonWidget("HIZLI (120 FPS)", GRAY, WHITE, size=(dp(250), dp(50)), pos=(SCREEN_WIDTH/2-125, SCREEN_HEIGHT*0.35+120))
         ]
         self.btn_back = ButtonWidget("GERI", WHITE, HOVER_GRAY, size=(dp(250), dp(50)), pos=(SCREEN_WIDTH/2-125, SCREEN_HEIGHT-120))
-        x_start = SCREEN_WIDTH/2 - (len(['GREEN', 'BLUE', 'YELLOW', 'PURPLE'])*70-10)/2
+        x_start = SCREEN_WIDTH/2 - (len(SNAKE_COLORS)*70-10)/2
         self.color_buttons = [
             ButtonWidget("", GREEN, HOVER_GRAY, size=(dp(60), dp(50)), pos=(x_start, SCREEN_HEIGHT*0.65+40)),
             ButtonWidget("", BLUE, HOVER_GRAY, size=(dp(60), dp(50)), pos=(x_start + 70, SCREEN_HEIGHT*0.65+40)),
@@ -270,172 +550,399 @@ class GameWidget(Widget):
         self.settings_fps_buttons[1].bind(on_press=lambda x: self.set_fps(60))
         self.settings_fps_buttons[2].bind(on_press=lambda x: self.set_fps(120))
         for i, btn in enumerate(self.color_buttons):
-            btn.bind(on_press=lambda x, idx=i: self.set_color([GREEN, BLUE, YELLOW, PURPLE][idx]))
+            btn.bind(on_press=lambda x, idx=i: self.set_color(SNAKE_COLORS[idx]))
 
     def set_state(self, state):
         self.game_state = state
 
+    def on_game_state(self, instance, state):
+        self.show_overlay(state)
+        if state == 'playing':
+            self.start_clock()
+        else:
+            self.stop_clock()
+            self.redraw_trigger()
+
+    def frame_interval(self):
+        # Ayardaki FPS; en düşük kalite seviyesinde çizim hızı ayrıca sınırlanır (simülasyon hızı değişmez)
+        return self.quality.budget(self.quality.level, settings['fps'])
+
+    def start_clock(self):
+        if self.sim_event is None:
+            self.quality.restart_window()
+            self.sim_event = Clock.schedule_interval(self.update, self.frame_interval())
+
+    def stop_clock(self):
+        if self.sim_event is not None:
+            self.sim_event.cancel()
+            self.sim_event = None
+
+    def redraw(self, dt):
+        # Oyun dışındaki ekranlarda yılanın son hali, durum ya da ayar değiştiğinde yeniden çizilir
+        self.snake_renderer.draw(settings['snake_color'], 1.0)
+
+    def show_overlay(self, state):
+        self.overlay_layer.clear()
+        if state == 'game_over':
+            self.set_text(self.final_score_label, f"SKORUNUZ: {self.score}", FONT_NAME, 20, SCREEN_WIDTH/2, SCREEN_HEIGHT/2, WHITE)
+            self.new_high_score_slot.clear()
+            if self.new_high_score_achieved:
+                self.new_high_score_slot.add(self.new_high_score_banner)
+        elif state == 'settings':
+            self.update_fps_buttons()
+        overlay = self.overlays.get(state)
+        if overlay is not None:
+            self.overlay_layer.add(overlay)
+        # Canvas artık her karede temizlenmediği için yalnızca geçerli ekranın düğmeleri gösterilir
+        visible = {'main_menu': self.menu_buttons,
+                   'settings': self.settings_fps_buttons + self.color_buttons + [self.btn_back]}.get(state, [])
+        for btn in self.menu_buttons + self.settings_fps_buttons + self.color_buttons + [self.btn_back]:
+            btn.opacity = 1 if btn in visible else 0
+            btn.disabled = btn not in visible
+
+    def on_score(self, instance, value):
+        self.set_text(self.score_label, f"SKOR: {value}", FONT_NAME, 15, 20, UI_HEIGHT/2, WHITE)
+
+    def on_high_score(self, instance, value):
+        self.set_text(self.high_score_label, f"YUKSEK SKOR: {value}", FONT_NAME, 15, SCREEN_WIDTH - 280, UI_HEIGHT/2, WHITE)
+
+    def on_power_up_active(self, instance, active):
+        if active:
+            self.hud_layer.add(self.power_up_bar)
+        else:
+            self.hud_layer.remove(self.power_up_bar)
+
+    def sync_foods(self):
+        self.food_renderer.sync(self.game.foods)
+
     def start_game(self, instance):
         self.game_state = 'playing'
         self.score = 0
         self.new_high_score_achieved = False
-        self.snake.reset()
-        self.snake.remove_power_up()
+        self.game.reset()
+        self.recorder = ReplayRecorder(self.game)
+        self.input_queue.clear()
+        self.applied_turns = []
+        self.input_latencies.clear()
         self.power_up_active = False
-        self.foods = [NormalFood(self.snake.segments, [])]
-        if SOUNDS_LOADED:
-            BACKGROUND_MUSIC.play()
+        self.accumulator = 0.0
+        self.sync_foods()
+        # Müzik henüz akışa hazır değilse oyun beklemeden başlar, müzik hazır olunca girer
+        ASSETS.when_ready('music', self.start_music)
+
+    def start_music(self, music):
+        if self.game_state == 'playing' and music.state != 'play':
+            music.play()
 
     def set_fps(self, fps):
         settings['fps'] = fps
-        Clock.unschedule(self.update)
-        Clock.schedule_interval(self.update, 1.0 / settings['fps'])
+        if self.profiler is not None:
+            self.profiler.target_frame = self.frame_interval()
+        self.update_fps_buttons()
+        if self.sim_event is not None:
+            self.stop_clock()
+            self.start_clock()
+
+    def update_fps_buttons(self):
+        for fps, btn in zip((30, 60, 120), self.settings_fps_buttons):
+            btn.set_base_color(GREEN if settings['fps'] == fps else GRAY)
 
     def set_color(self, color):
         settings['snake_color'] = color
+        self.update_color_marker()
+        self.redraw_trigger()
+
+    def update_color_marker(self):
+        btn = self.color_buttons[SNAKE_COLORS.index(settings['snake_color'])]
+        self.color_marker.rectangle = (btn.x, btn.y, btn.width, btn.height)
 
     def update(self, dt):
+        update_start = time.perf_counter()
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.begin_frame(dt)
+        # Simülasyon sabit SIMULATION_HZ ile ilerler; FPS ayarı yalnızca çizim sıklığını belirler
+        steps = 0
         if self.game_state == 'playing':
-            if self.power_up_active and self.power_up_end_time < Window._get_ticks():
-                self.power_up_active = False
-                self.snake.remove_power_up()
-            
-            current_food_positions = [f.position for f in self.foods]
-            for food in self.foods[:]:
-                dist = math.hypot(self.snake.segments[0][0] - food.position[0],
-                                  self.snake.segments[0][1] - food.position[1])
-                if dist < SNAKE_HEAD_RADIUS:
-                    self.foods.remove(food)
-                    if SOUNDS_LOADED:
-                        EAT_SOUND.play()
-                    if isinstance(food, NormalFood):
-                        self.score += 5
-                        self.snake.growth_pending += GROWTH_PER_FOOD
-                        self.foods.append(NormalFood(self.snake.segments, current_food_positions))
-                        if random.random() < POWERUP_SPAWN_CHANCE:
-                            self.foods.append(PowerUpFood(self.snake.segments, current_food_positions))
-                    elif isinstance(food, PowerUpFood):
-                        self.score += 25
-                        self.power_up_active = True
-                        self.power_up_end_time = Window._get_ticks() + POWERUP_DURATION_MS
-                        self.snake.apply_power_up()
-            
-            self.snake.update()
-            if self.snake.check_collision():
-                self.game_state = 'game_over'
-                if self.score > self.high_score:
-                    self.new_high_score_achieved = True
-                    self.high_score = self.score
-                if SOUNDS_LOADED:
-                    BACKGROUND_MUSIC.stop()
-                    GAME_OVER_SOUND.play()
+            self.accumulator += dt
+            while self.accumulator >= SIMULATION_STEP and self.game_state == 'playing':
+                self.step()
+                self.accumulator -= SIMULATION_STEP
+                steps += 1
+                if steps == MAX_STEPS_PER_FRAME:
+                    # Cihaz yetişemiyorsa biriken süre atılır, oyun ağır çekime düşer ama donmaz
+                    self.accumulator = 0.0
+                    break
+        alpha = self.accumulator / SIMULATION_STEP if self.game_state == 'playing' else 1.0
         
         if self.score > self.high_score:
             self.high_score = self.score
         
-        self.canvas.clear()
-        with self.canvas:
-            Color(*BLACK)
-            Rectangle(pos=(0, 0), size=(SCREEN_WIDTH, SCREEN_HEIGHT))
-        self.background
-        self.snake.draw(self.canvas, settings['snake_color'])
-        for food in self.foods:
-            food.draw(self.canvas)
-        
-        with self.canvas:
-            Color(*BLACK)
-            Rectangle(pos=(0, 0), size=(SCREEN_WIDTH, UI_HEIGHT))
-            Color(*WHITE)
-            Line(points=[0, UI_HEIGHT, SCREEN_WIDTH, UI_HEIGHT], width=2)
-            self.draw_text(f"SKOR: {self.score}", FONT_NAME, 15, 20, UI_HEIGHT/2, WHITE)
-            self.draw_text(f"YUKSEK SKOR: {self.high_score}", FONT_NAME, 15, SCREEN_WIDTH - 280, UI_HEIGHT/2, WHITE)
-            
-            if self.power_up_active:
-                remaining_ms = self.power_up_end_time - Window._get_ticks()
-                self.power_up_remaining = remaining_ms / POWERUP_DURATION_MS
-                if remaining_ms > 0:
-                    bar_x = SCREEN_WIDTH - POWERUP_BAR_WIDTH - 20
-                    bar_y = 10
-                    fill_width = self.power_up_remaining * POWERUP_BAR_WIDTH
-                    Color(*GRAY)
-                    Rectangle(pos=(bar_x, bar_y), size=(POWERUP_BAR_WIDTH, POWERUP_BAR_HEIGHT))
-                    Color(*YELLOW)
-                    Rectangle(pos=(bar_x, bar_y), size=(fill_width, POWERUP_BAR_HEIGHT))
-                    self.draw_text("HIZLI!", FONT_NAME, 15, bar_x - 50, bar_y + 8, YELLOW)
-        
-        if self.game_state == 'main_menu':
-            self.draw_text("RETRO YILAN", FONT_NAME, 35, SCREEN_WIDTH/2, SCREEN_HEIGHT*0.15, WHITE)
-        elif self.game_state == 'settings':
-            self.draw_text("AYARLAR", FONT_NAME, 30, SCREEN_WIDTH/2, SCREEN_HEIGHT*0.1, WHITE)
-            self.draw_text("Oyun Hizi (FPS)", FONT_NAME, 20, SCREEN_WIDTH/2, SCREEN_HEIGHT*0.28, WHITE)
-            for fps, btn in {30: self.settings_fps_buttons[0], 60: self.settings_fps_buttons[1], 120: self.settings_fps_buttons[2]}.items():
-                btn.background_color = GREEN if settings['fps'] == fps else GRAY
-            self.draw_text("Yilan Rengi", FONT_NAME, 20, SCREEN_WIDTH/2, SCREEN_HEIGHT*0.58, WHITE)
-            for btn in self.color_buttons:
-                if settings['snake_color'] == btn.background_color:
-                    with self.canvas:
-                        Color(*WHITE)
-                        Line(rectangle=(btn.x, btn.y, btn.width, btn.height), width=3)
-        elif self.game_state == 'game_over':
-            with self.canvas:
-                Color(0, 0, 0, 0.7)
-                Rectangle(pos=(0, 0), size=(SCREEN_WIDTH, SCREEN_HEIGHT))
-                self.draw_text("OYUN BITTI", FONT_NAME, 30, SCREEN_WIDTH/2, SCREEN_HEIGHT/3, RED)
-                self.draw_text(f"SKORUNUZ: {self.score}", FONT_NAME, 20, SCREEN_WIDTH/2, SCREEN_HEIGHT/2, WHITE)
-                if self.new_high_score_achieved:
-                    self.draw_text("YENI YUKSEK SKOR!", FONT_NAME, 20, SCREEN_WIDTH/2, SCREEN_HEIGHT/2 + 50, YELLOW)
-                self.draw_text("Ana Menu Icin Dokun", FONT_NAME, 15, SCREEN_WIDTH/2, SCREEN_HEIGHT*0.75, WHITE)
-
-    def draw_text(self, text, font, size, x, y, color):
-        with self.canvas:
-            Color(*color)
-            label = CoreLabel(text=text, font_name=font, font_size=dp(size))
-            label.refresh()
-            texture = label.texture
-            Rectangle(texture=texture, pos=(x - texture.size[0]/2, y - texture.size[1]/2), size=texture.size)
+        if profiler is not None:
+            render_start = time.perf_counter()
+            profiler.add('sim', render_start - update_start)
+        self.snake_renderer.draw(settings['snake_color'], alpha)
+        if profiler is not None:
+            profiler.add('render_prep', time.perf_counter() - render_start)
+        if self.applied_turns:
+            self.measure_input_latency(profiler)
+        if self.power_up_active:
+            self.power_up_remaining = self.game.power_up_remaining(alpha)
+            self.power_up_fill.size = (max(0, self.power_up_remaining) * POWERUP_BAR_WIDTH, POWERUP_BAR_HEIGHT)
+
+        self.update_time = time.perf_counter() - update_start
+        if profiler is not None:
+            profiler.add('update', self.update_time)
+            self.record_profile_counters(profiler, steps, dt)
+        if settings['auto_quality'] and self.sim_event is not None:
+            # Çizim bu güncellemeden sonra yapılır; gönderim süresi bir önceki kareninkidir
+            level = self.quality.observe(dt, self.update_time + self.submit_time, settings['fps'])
+            if level is not None:
+                self.apply_quality(level)
+
+    def enable_profiler(self):
+        self.profiler = FrameProfiler(self.frame_interval())
+        self.game.profiler = self.profiler
+        self.profile_hud_elapsed = PROFILE_HUD_INTERVAL
+
+    def disable_profiler(self):
+        self.profiler = None
+        self.game.profiler = None
+        self.profile_layer.clear()
+
+    def on_window_draw(self, window):
+        # Bağlı işleyiciler pencerenin kendi on_draw'ından önce çalışır: GPU'ya gönderim buradan flip'e kadar sürer
+        self.draw_start = time.perf_counter()
+
+    def on_window_flip(self, window):
+        self.submit_time = time.perf_counter() - self.draw_start
+        if self.profiler is not None:
+            self.profiler.add('submit', self.submit_time)
+
+    def record_profile_counters(self, profiler, steps, dt):
+        profiler.set('steps', steps)
+        profiler.set('instructions', count_instructions(self.canvas.before) + count_instructions(self.canvas))
+        profiler.set('segments', self.snake.length)
+        profiler.set('foods', len(self.game.foods))
+        self.profile_hud_elapsed += dt
+        if self.profile_hud_elapsed >= PROFILE_HUD_INTERVAL:
+            self.profile_hud_elapsed = 0.0
+            self.refresh_profile_hud(profiler.summary())
+
+    def refresh_profile_hud(self, summary):
+        # Yazı her yenilemede değiştiği için metin önbelleği kullanılmaz; aksi halde skor dokularını dışarı iterdi
+        text = (f"p50 {summary['p50_ms']:.1f}  p95 {summary['p95_ms']:.1f}  p99 {summary['p99_ms']:.1f} ms  "
+                f"dusen {summary['dropped']}/{summary['frames']}  girdi p95 {summary['input_p95_ms']:.0f} ms  "
+                f"seg {summary['segments']}  yem {summary['foods']}  komut {summary['instructions']}")
+        label = CoreLabel(text=text, font_size=PROFILE_FONT_SIZE)
+        label.refresh()
+        self.profile_layer.clear()
+        self.profile_layer.add(Color(0, 0, 0, 0.6))
+        self.profile_layer.add(Rectangle(pos=(0, SCREEN_HEIGHT - label.texture.size[1]), size=label.texture.size))
+        self.profile_layer.add(Color(*WHITE))
+        self.profile_layer.add(Rectangle(texture=label.texture, pos=(0, SCREEN_HEIGHT - label.texture.size[1]),
+                                         size=label.texture.size))
+
+    def export_profile(self):
+        if self.profiler is None:
+            return None
+        name = time.strftime("profile-%Y%m%d-%H%M%S")
+        try:
+            base = os.path.join(App.get_running_app().user_data_dir, name)
+            self.profiler.export_csv(base + '.csv')
+            self.profiler.export_json(base + '.json')
+        except OSError as e:
+            # F10'dan ya da kapanırken çağrılır; yazılamayan bir dosya ne girdi işleyicisini ne çıkışı bozmalı
+            Logger.warning(f"Profile: cannot export {name}: {e}")
+            return None
+        return base
+
+    def measure_input_latency(self, profiler):
+        # Girdinin gelişinden, dönüşü içeren karenin çizime hazırlanmasına kadar geçen süre
+        now = time.perf_counter()
+        latency = 0.0
+        for stamp in self.applied_turns:
+            latency = max(latency, now - stamp)
+            self.input_latencies.append(now - stamp)
+        self.applied_turns = []
+        if profiler is not None:
+            profiler.add('input_latency', latency)
+
+    def report_input_latency(self):
+        if not self.input_latencies:
+            return
+        samples = sorted(self.input_latencies)
+        p50, p95 = samples[len(samples) // 2], samples[min(len(samples) - 1, len(samples) * 95 // 100)]
+        Logger.info(f"Input: {len(samples)} turns, latency p50={p50 * 1000:.1f}ms p95={p95 * 1000:.1f}ms "
+                    f"max={samples[-1] * 1000:.1f}ms, {self.input_queue.dropped} dropped")
+
+    def step(self):
+        # Sıradaki en fazla bir dönüş bu adımın başında uygulanır
+        queued = self.input_queue.pop()
+        if queued is not None:
+            direction, stamp = queued
+            self.apply_turn(direction)
+            self.applied_turns.append(stamp)
+        events = self.game.step()
+        self.score = self.game.score
+        self.power_up_active = self.game.power_up_active
+        self.sync_foods()
+        for event, data in events:
+            if event == EVENT_EAT:
+                MIXER.play('powerup' if isinstance(data, PowerUpFood) else 'eat')
+            elif event == EVENT_GAME_OVER:
+                self.end_game()
+
+    def end_game(self):
+        if self.score > self.high_score:
+            self.new_high_score_achieved = True
+            self.high_score = self.score
+        # Güçlendirme sürerken ölünürse HUD çubuğu oyun dışı ekranlarda donup kalmasın
+        self.power_up_active = False
+        self.game_state = 'game_over'
+        self.save_replay()
+        self.report_input_latency()
+        MIXER.report()
+        ASSETS.stop('music')
+        MIXER.play('game_over')
+
+    def turn(self, direction):
+        # Girdiler hemen uygulanmaz; step() her adımda sıradan bir dönüş alır
+        self.input_queue.push(direction, self.snake, time.perf_counter())
+
+    def apply_turn(self, direction):
+        # Kayıt, dönüşün uygulandığı simülasyon adımıyla tutulur; tekrar oynatma da aynı adımda uygular
+        if self.recorder is not None:
+            self.recorder.record(self.game.tick, direction)
+        self.snake.change_direction(direction)
+
+    def save_replay(self):
+        # Son REPLAY_KEEP oyun uygulama veri klasöründe saklanır; `python replay.py` ile oynatılır
+        if self.recorder is None:
+            return None
+        recorder, self.recorder = self.recorder, None
+        # Aynı saniyede biten oyunlar birbirinin üzerine yazılmasın diye adda tohum da bulunur
+        filename = time.strftime("replay-%Y%m%d-%H%M%S") + f"-{recorder.seed}.snr"
+        try:
+            folder = os.path.join(App.get_running_app().user_data_dir, REPLAY_DIR)
+            os.makedirs(folder, exist_ok=True)
+            path = os.path.join(folder, filename)
+            recorder.save(path, self.game)
+            for old in sorted(name for name in os.listdir(folder) if name.endswith('.snr'))[:-REPLAY_KEEP]:
+                os.remove(os.path.join(folder, old))
+        except OSError as e:
+            # Oyun sonu ekranı kayıt yazılamadı diye kesilmez
+            Logger.warning(f"Replay: cannot save {filename}: {e}")
+            return None
+        return path
+
+    def draw_text(self, group, text, font, size, x, y, color):
+        # Renk dokuya işlenir; böylece aynı yazı her renk için ayrı önbelleklenir
+        group.add(Color(*WHITE))
+        rect = Rectangle()
+        group.add(rect)
+        self.set_text(rect, text, font, size, x, y, color)
+        return rect
+
+    def set_text(self, rect, text, font, size, x, y, color):
+        if self.profiler is not None:
+            start = time.perf_counter()
+            texture = self.text_cache.get(text, font, size, color)
+            self.profiler.add('text', time.perf_counter() - start)
+        else:
+            texture = self.text_cache.get(text, font, size, color)
+        if rect.texture is texture:
+            return
+        rect.texture = texture
+        rect.size = texture.size
+        rect.pos = (x - texture.size[0]/2, y - texture.size[1]/2)
 
     def on_touch_down(self, touch):
         if self.game_state == 'game_over':
             self.game_state = 'main_menu'
         elif self.game_state == 'playing':
-            self.touch_start_pos = touch.pos
+            touch.ud['swipe_start'] = touch.pos
         return super().on_touch_down(touch)
 
+    def on_touch_move(self, touch):
+        # Kaydırma, parmak kalkmayı beklemeden eşik aşıldığı anda tanınır; başlangıç noktası
+        # yenilendiği için aynı hareket içinde köşe dönülerek ikinci bir dönüş de verilebilir
+        if self.game_state == 'playing':
+            self.detect_swipe(touch)
+        return super().on_touch_move(touch)
+
     def on_touch_up(self, touch):
-        if self.game_state == 'playing' and self.touch_start_pos is not None:
-            dx, dy = touch.pos[0] - self.touch_start_pos[0], touch.pos[1] - self.touch_start_pos[1]
-            if math.hypot(dx, dy) > TOUCH_SENSITIVITY:
-                if abs(dx) > abs(dy):
-                    self.snake.change_direction([1 if dx > 0 else -1, 0])
-                else:
-                    self.snake.change_direction([0, 1 if dy > 0 else -1])
-            self.touch_start_pos = None
+        if self.game_state == 'playing':
+            self.detect_swipe(touch)
+        touch.ud.pop('swipe_start', None)
         return super().on_touch_up(touch)
 
+    def detect_swipe(self, touch):
+        start = touch.ud.get('swipe_start')
+        if start is None:
+            return
+        dx, dy = touch.pos[0] - start[0], touch.pos[1] - start[1]
+        if math.hypot(dx, dy) > TOUCH_SENSITIVITY:
+            if abs(dx) > abs(dy):
+                self.turn([1 if dx > 0 else -1, 0])
+            else:
+                self.turn([0, 1 if dy > 0 else -1])
+            touch.ud['swipe_start'] = touch.pos
+
     def on_keyboard(self, window, key, scancode, codepoint, modifier):
         if key == 27:  # ESC
             App.get_running_app().stop()
+        elif key == PROFILE_TOGGLE_KEY:
+            if self.profiler is None:
+                self.enable_profiler()
+            else:
+                self.disable_profiler()
+        elif key == PROFILE_EXPORT_KEY:
+            self.export_profile()
         if self.game_state == 'playing':
             if key in (273, 119):  # Up, W
-                self.snake.change_direction([0, -1])
+                self.turn([0, -1])
             elif key in (274, 115):  # Down, S
-                self.snake.change_direction([0, 1])
+                self.turn([0, 1])
             elif key in (276, 97):  # Left, A
-                self.snake.change_direction([-1, 0])
+                self.turn([-1, 0])
             elif key in (275, 100):  # Right, D
-                self.snake.change_direction([1, 0])
+                self.turn([1, 0])
 
 class SnakeApp(App):
+    stopped = False
+
     def build(self):
+        # Küçük efektler önce, akıtılan müzik en son yüklenir; yükleme pencere kurulurken sürer
+        ASSETS.add('eat', 'eat_sound.wav', KIND_VOICES, EFFECT_VOICES['eat'])
+        ASSETS.add('game_over', 'game_over_sound.wav', KIND_VOICES, EFFECT_VOICES['game_over'])
+        ASSETS.add('powerup', 'powerup.wav', KIND_VOICES, EFFECT_VOICES['powerup'])
+        background = background_image_path()
+        if background is not None:
+            ASSETS.add('background', background, KIND_IMAGE)
+        ASSETS.add('music', 'background_music.mp3', KIND_MUSIC)
+        ASSETS.start()
+        # Efekt kanalları yüklendikçe karıştırıcıya verilir; o zamana kadarki istekler düşmüş sayılır
+        for name in EFFECT_VOICES:
+            ASSETS.when_ready(name, lambda voices, name=name: MIXER.add_effect(name, voices))
+        MIXER.start()
         game = GameWidget()
         Window.bind(on_keyboard=game.on_keyboard)
+        STARTUP.mark('build')
         return game
 
     def on_stop(self):
+        # stop() ile kapatılınca Kivy on_stop'u run() dönerken bir kez daha gönderir; o sırada çalışan uygulama
+        # artık yoktur (App.get_running_app() None döner)
+        if self.stopped:
+            return
+        self.stopped = True
         with open(HIGHSCORE_FILE, "w") as f:
             f.write(str(self.root.high_score))
-        if SOUNDS_LOADED:
-            BACKGROUND_MUSIC.stop()
+        ASSETS.stop('music')
+        MIXER.stop()
+        self.root.save_replay()
+        self.root.export_profile()
 
 if __name__ == '__main__':
     SnakeApp().run()
\ No newline at end of file
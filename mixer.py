@@ -0,0 +1,131 @@
+# Ses efektleri için küçük karıştırıcı: her efektin önceden çözülmüş birkaç sesi (ses kanalı) vardır, çalma
+# istekleri kendi iş parçacığında sırayla yerine getirilir. Böylece art arda gelen efektler birbirini kesmez ve
+# bazı Android ses arka uçlarında bekleten play() çağrıları çizim iş parçacığını durdurmaz.
+import threading
+import time
+from collections import deque
+from queue import SimpleQueue
+
+from kivy.logger import Logger
+
+MIXER_MAX_PENDING = 8
+MIXER_LATENCY_SAMPLES = 256
+
+class EffectVoices:
+    # Kanallar sırayla (round-robin) kullanılır; sıradaki kanal çalıyorsa ilk boş kanal aranır, hiçbiri boş
+    # değilse sıradaki, yani en önce başlamış olan kanal kesilip yeniden kullanılır
+    def __init__(self, voices):
+        self.voices = voices
+        self.next = 0
+
+    def allocate(self):
+        count = len(self.voices)
+        for i in range(count):
+            index = (self.next + i) % count
+            if self.voices[index].state != 'play':
+                break
+        else:
+            index = self.next
+        self.next = (index + 1) % count
+        return self.voices[index]
+
+class Mixer:
+    def __init__(self, max_pending=MIXER_MAX_PENDING):
+        self.max_pending = max_pending
+        self.effects = {}
+        self.requests = SimpleQueue()
+        self.lock = threading.Lock()
+        self.pending = 0
+        self.requested = 0
+        self.played = 0
+        self.stolen = 0
+        self.failed = 0
+        self.dropped_not_ready = 0
+        self.dropped_backlog = 0
+        self.latencies = deque(maxlen=MIXER_LATENCY_SAMPLES)
+        self.call_times = deque(maxlen=MIXER_LATENCY_SAMPLES)
+        self.thread = None
+
+    def add_effect(self, name, voices):
+        # SoundLoader uygun sağlayıcı bulamazsa None döndürür; çalınamayan kopyalar kanal sayılmaz
+        voices = [voice for voice in voices if voice is not None]
+        if not voices:
+            Logger.warning(f"Mixer: no playable voices for {name}")
+            return
+        self.effects[name] = EffectVoices(voices)
+
+    def start(self):
+        self.thread = threading.Thread(target=self.run, name='sound-mixer', daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        if self.thread is not None:
+            self.requests.put(None)
+            self.thread = None
+
+    def play(self, name):
+        # Ana iş parçacığından çağrılır ve hiç beklemez; efekt yüklenmemişse ya da kuyruk dolmuşsa istek düşer
+        self.requested += 1
+        if name not in self.effects:
+            self.dropped_not_ready += 1
+            return False
+        with self.lock:
+            if self.pending >= self.max_pending:
+                self.dropped_backlog += 1
+                return False
+            self.pending += 1
+        self.requests.put((name, time.perf_counter()))
+        return True
+
+    def run(self):
+        while True:
+            request = self.requests.get()
+            if request is None:
+                return
+            name, queued_at = request
+            played = False
+            try:
+                start = time.perf_counter()
+                voice = self.effects[name].allocate()
+                if voice.state == 'play':
+                    voice.stop()
+                    self.stolen += 1
+                voice.play()
+                done = time.perf_counter()
+                self.latencies.append(done - queued_at)
+                self.call_times.append(done - start)
+                played = True
+            except Exception:
+                # Tek bir bozuk ses iş parçacığını durdurup sonraki tüm istekleri sessizce biriktirmemeli
+                Logger.exception(f"Mixer: cannot play {name}")
+                self.failed += 1
+            finally:
+                with self.lock:
+                    self.pending -= 1
+                    if played:
+                        self.played += 1
+
+    def stats(self):
+        latencies = sorted(self.latencies)
+        calls = sorted(self.call_times)
+        def ms(values, p):
+            return values[min(len(values) - 1, len(values) * p // 100)] * 1000 if values else 0.0
+        return {
+            'requested': self.requested,
+            'played': self.played,
+            'stolen': self.stolen,
+            'failed': self.failed,
+            'dropped_not_ready': self.dropped_not_ready,
+            'dropped_backlog': self.dropped_backlog,
+            'latency_p50_ms': ms(latencies, 50),
+            'latency_p95_ms': ms(latencies, 95),
+            'latency_max_ms': latencies[-1] * 1000 if latencies else 0.0,
+            'play_call_p95_ms': ms(calls, 95),
+        }
+
+    def report(self):
+        s = self.stats()
+        Logger.info(f"Mixer: {s['played']}/{s['requested']} played, {s['stolen']} stolen, {s['failed']} failed, dropped "
+                    f"{s['dropped_not_ready']} not ready + {s['dropped_backlog']} backlog; latency "
+                    f"p50={s['latency_p50_ms']:.1f}ms p95={s['latency_p95_ms']:.1f}ms max={s['latency_max_ms']:.1f}ms, "
+                    f"play() p95={s['play_call_p95_ms']:.1f}ms")
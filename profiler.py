@@ -0,0 +1,89 @@
+# İsteğe bağlı kare profilleyici: her karenin aşama sürelerini ve sayaçlarını sabit boyutlu bir halka arabellekte tutar.
+# Kapalıyken hiç oluşturulmaz; ölçüm yapan kod yalnızca `profiler is not None` denetimi öder.
+# Aşamalar iç içe olabilir: 'sim' kendi içinde 'move', 'collision', 'food_spawn' ve 'text' sürelerini de kapsar.
+# 'input_latency', o karede ekrana yansıyan dönüşlerin en uzun girdi-hareket gecikmesidir. Süreler saniye cinsindendir.
+import csv
+import json
+import time
+
+PHASES = ('frame', 'update', 'sim', 'move', 'collision', 'food_spawn', 'render_prep', 'text', 'submit', 'input_latency')
+COUNTERS = ('steps', 'instructions', 'segments', 'foods')
+FIELDS = PHASES + COUNTERS
+PERCENTILES = (50, 95, 99)
+PROFILE_CAPACITY = 1024
+DROPPED_FRAME_FACTOR = 1.5
+
+class FrameProfiler:
+    def __init__(self, target_frame, capacity=PROFILE_CAPACITY):
+        self.target_frame = target_frame
+        self.capacity = capacity
+        self.rows = [[0.0] * len(FIELDS) for _ in range(capacity)]
+        self.field_index = {name: i for i, name in enumerate(FIELDS)}
+        self.blank = [0.0] * len(FIELDS)
+        self.current = self.rows[0]
+        self.count = 0
+        self.dropped_total = 0
+
+    def begin_frame(self, frame_time):
+        # Bir sonraki begin_frame çağrısına kadar eklenen her süre bu kareye yazılır
+        row = self.rows[self.count % self.capacity]
+        row[:] = self.blank
+        row[0] = frame_time
+        self.current = row
+        self.count += 1
+        if frame_time > self.target_frame * DROPPED_FRAME_FACTOR:
+            self.dropped_total += 1
+
+    def add(self, phase, seconds):
+        self.current[self.field_index[phase]] += seconds
+
+    def set(self, counter, value):
+        self.current[self.field_index[counter]] = value
+
+    def frames(self):
+        # Eskiden yeniye; arabellek dolmadıysa yalnızca yazılmış kareler
+        if self.count <= self.capacity:
+            return self.rows[:self.count]
+        start = self.count % self.capacity
+        return self.rows[start:] + self.rows[:start]
+
+    def percentiles(self, field='frame'):
+        # Gecikme gibi her karede olmayan ölçümlerde boş (0) kareler sayılmaz
+        i = self.field_index[field]
+        values = sorted(row[i] for row in self.frames() if field == 'frame' or row[i] > 0)
+        if not values:
+            return {p: 0.0 for p in PERCENTILES}
+        # En yakın sıra yöntemi: sıralı listede ceil(p/100 * n). eleman
+        return {p: values[max(0, -(-p * len(values) // 100) - 1)] for p in PERCENTILES}
+
+    def summary(self):
+        frames = self.frames()
+        threshold = self.target_frame * DROPPED_FRAME_FACTOR
+        latest = frames[-1] if frames else self.blank
+        result = {f"p{p}_ms": seconds * 1000 for p, seconds in self.percentiles().items()}
+        result.update({f"input_p{p}_ms": seconds * 1000 for p, seconds in self.percentiles('input_latency').items()})
+        result.update({
+            'frames': len(frames),
+            'dropped': sum(1 for row in frames if row[0] > threshold),
+            'dropped_total': self.dropped_total,
+            'target_ms': self.target_frame * 1000,
+        })
+        for counter in COUNTERS:
+            result[counter] = int(latest[self.field_index[counter]])
+        return result
+
+    def export_csv(self, path):
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(FIELDS)
+            writer.writerows(self.frames())
+
+    def export_json(self, path):
+        data = {
+            'recorded_at': time.strftime("%Y-%m-%dT%H:%M:%S"),
+            'fields': FIELDS,
+            'summary': self.summary(),
+            'frames': self.frames(),
+        }
+        with open(path, "w") as f:
+            json.dump(data, f)
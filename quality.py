@@ -0,0 +1,91 @@
+# Ölçülen kare sürelerine göre çizim kalitesini adım adım düşüren/yükselten denetleyici. Kivy'den bağımsızdır;
+# seviyelerin nasıl uygulanacağı çizim tarafına kalır.
+import time
+from collections import deque, namedtuple
+
+# segments: daire kenar sayısı, spacing: gövde örnek aralığı çarpanı, background: döşeli arka plan,
+# max_fps: çizim hızı üst sınırı (None = ayardaki FPS); simülasyon her seviyede SIMULATION_HZ ile sürer
+QualityLevel = namedtuple('QualityLevel', 'name segments spacing background max_fps')
+QUALITY_LEVELS = (
+    QualityLevel('high', 16, 1.0, True, None),
+    QualityLevel('fewer_segments', 12, 1.0, True, None),
+    QualityLevel('sparse_body', 12, 1.5, True, None),
+    QualityLevel('no_background', 12, 1.5, False, None),
+    QualityLevel('low', 8, 2.0, False, None),
+    QualityLevel('half_rate', 8, 2.0, False, 30),
+)
+QUALITY_WINDOW = 60
+DOWNGRADE_RATIO = 0.9
+UPGRADE_RATIO = 0.5
+UPGRADE_WINDOWS = 3
+MAX_UPGRADE_WINDOWS = 48
+
+class QualityController:
+    # Her QUALITY_WINDOW karede bir pencerenin 90. yüzdelikleri değerlendirilir. Kararlar karede harcanan
+    # süreyle (güncelleme + GPU'ya gönderim) verilir; kare aralığı yalnızca kayda geçer. Kare aralığı ekranın
+    # yenileme hızına bağlıdır: 60 Hz bir ekranda 120 FPS ayarı hiç yük yokken de bütçeyi aşar, düşük kaliteye
+    # geçmek ise bunu düzeltmez. Harcanan süre seviyenin kare bütçesinin DOWNGRADE_RATIO katını aşarsa bir seviye
+    # düşülür; bir üst seviyenin bütçesinin UPGRADE_RATIO katının altında `upgrade_windows` pencere kalırsa çıkılır.
+    # Yükseltmenin hemen ardından yine düşmek gerekirse beklenen pencere sayısı ikiye katlanır; böylece seviye
+    # iki değer arasında gidip gelmez.
+    def __init__(self, levels=QUALITY_LEVELS, window=QUALITY_WINDOW):
+        self.levels = levels
+        self.window = window
+        self.level = 0
+        self.samples = deque(maxlen=window)
+        self.good_windows = 0
+        self.upgrade_windows = UPGRADE_WINDOWS
+        self.just_upgraded = False
+        self.decisions = []
+
+    @property
+    def current(self):
+        return self.levels[self.level]
+
+    def budget(self, level, fps):
+        cap = self.levels[level].max_fps
+        return 1.0 / (min(fps, cap) if cap else fps)
+
+    def restart_window(self):
+        # Saat yeniden kurulduğunda ya da seviye değiştiğinde geçiş karelerinin ölçüme karışmaması için
+        self.samples.clear()
+
+    def observe(self, frame_time, busy_time, fps):
+        # Seviye değiştiyse yeni QualityLevel, değilse None döner
+        self.samples.append((frame_time, busy_time))
+        if len(self.samples) < self.window:
+            return None
+        rank = self.window * 9 // 10
+        frame_p90 = sorted(frame for frame, _ in self.samples)[rank]
+        busy_p90 = sorted(busy for _, busy in self.samples)[rank]
+        self.samples.clear()
+        target = self.budget(self.level, fps)
+        if busy_p90 > target * DOWNGRADE_RATIO and self.level < len(self.levels) - 1:
+            if self.just_upgraded:
+                self.upgrade_windows = min(self.upgrade_windows * 2, MAX_UPGRADE_WINDOWS)
+                self.just_upgraded = False
+            return self.change(self.level + 1, frame_p90, busy_p90, target)
+        self.just_upgraded = False
+        if self.level > 0 and busy_p90 < self.budget(self.level - 1, fps) * UPGRADE_RATIO:
+            self.good_windows += 1
+            if self.good_windows >= self.upgrade_windows:
+                self.just_upgraded = True
+                return self.change(self.level - 1, frame_p90, busy_p90, target)
+        else:
+            self.good_windows = 0
+        return None
+
+    def change(self, level, frame_p90, busy_p90, target):
+        self.decisions.append({
+            'time': time.time(),
+            'from': self.current.name,
+            'to': self.levels[level].name,
+            'frame_p90_ms': frame_p90 * 1000,
+            'busy_p90_ms': busy_p90 * 1000,
+            'target_ms': target * 1000,
+            'upgrade_windows': self.upgrade_windows,
+        })
+        self.level = level
+        self.good_windows = 0
+        self.samples.clear()
+        return self.current
@@ -0,0 +1,152 @@
+# Oyun kayıtları: tohum, oyun ayarları ve simülasyon adımına bağlı yön girdileri küçük bir ikili dosyada tutulur.
+# Oynatma pencere olmadan, olabildiğince hızlı çalışır ve kayıttaki son adım/skorla karşılaştırılarak doğrulanır;
+# böylece sahadan gelen uzun oyunlar, çarpışma ya da yem yerleştirme değişikliklerinde hem kıyas hem sınama olur.
+#
+# Dosya düzeni (little-endian):
+#   başlık   : 'SNKR', sürüm (u8), tohum (u64), genişlik, yükseklik, yoğunluk (f64), ayar JSON uzunluğu (u16)
+#   ayarlar  : GameConfig'e verilen ek ayarlar, JSON
+#   girdiler : her biri varint((önceki girdiden beri geçen adım << 2) | yön kodu)
+#   son ek   : son adım (u32), skor (u32), oyun bitti mi (u8)
+import argparse
+import json
+import struct
+import sys
+import time
+
+from engine import GameConfig, Game
+
+REPLAY_MAGIC = b'SNKR'
+# Aynı tohumdan farklı bir oyun üreten her motor değişikliğinde (ör. yem yerleştirmenin rastgele sayı kullanımı) artar
+REPLAY_VERSION = 2
+HEADER = struct.Struct('<4sBQdddH')
+TRAILER = struct.Struct('<IIB')
+DIRECTIONS = ((0, -1), (0, 1), (-1, 0), (1, 0))
+DIRECTION_CODES = {direction: code for code, direction in enumerate(DIRECTIONS)}
+
+class ReplayError(ValueError):
+    pass
+
+def write_varint(out, value):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+def read_varint(data, pos):
+    value = shift = 0
+    while True:
+        if pos >= len(data):
+            raise ReplayError("truncated input record")
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+class ReplayRecorder:
+    # Girdiler, uygulandıkları anda tamamlanmış simülasyon adımı sayısıyla (game.tick) kaydedilir
+    def __init__(self, game):
+        self.seed = game.seed
+        self.config = game.config
+        self.body = bytearray()
+        self.last_tick = 0
+        self.inputs = 0
+
+    def record(self, tick, direction):
+        code = DIRECTION_CODES.get(tuple(direction))
+        if code is None:
+            return
+        write_varint(self.body, ((tick - self.last_tick) << 2) | code)
+        self.last_tick = tick
+        self.inputs += 1
+
+    def to_bytes(self, game):
+        config = self.config
+        overrides = json.dumps(config.overrides, sort_keys=True).encode()
+        return b"".join((
+            HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, self.seed, config.width, config.height, config.density,
+                        len(overrides)),
+            overrides,
+            bytes(self.body),
+            TRAILER.pack(game.tick, game.score, game.over),
+        ))
+
+    def save(self, path, game):
+        with open(path, "wb") as f:
+            f.write(self.to_bytes(game))
+
+class Replay:
+    def __init__(self, seed, config, inputs, final_tick, final_score, finished):
+        self.seed = seed
+        self.config = config
+        self.inputs = inputs
+        self.final_tick = final_tick
+        self.final_score = final_score
+        self.finished = finished
+
+    @classmethod
+    def from_bytes(cls, data):
+        if len(data) < HEADER.size + TRAILER.size:
+            raise ReplayError("file too short")
+        magic, version, seed, width, height, density, overrides_size = HEADER.unpack_from(data)
+        if magic != REPLAY_MAGIC:
+            raise ReplayError("not a replay file")
+        if version != REPLAY_VERSION:
+            raise ReplayError(f"unsupported replay version {version}")
+        pos = HEADER.size + overrides_size
+        overrides = json.loads(data[HEADER.size:pos].decode())
+        end = len(data) - TRAILER.size
+        final_tick, final_score, finished = TRAILER.unpack_from(data, end)
+        inputs = []
+        tick = 0
+        while pos < end:
+            value, pos = read_varint(data, pos)
+            tick += value >> 2
+            inputs.append((tick, DIRECTIONS[value & 3]))
+        config = GameConfig(width, height, density=density, **overrides)
+        return cls(seed, config, inputs, final_tick, final_score, bool(finished))
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+    def play(self):
+        # Kayıttaki son adıma kadar ya da oyun bitene kadar, her adımdan önce o adımın girdileri uygulanır
+        game = Game(self.config, self.seed)
+        snake = game.snake
+        inputs = self.inputs
+        i, count = 0, len(inputs)
+        while not game.over and game.tick < self.final_tick:
+            while i < count and inputs[i][0] == game.tick:
+                snake.change_direction(list(inputs[i][1]))
+                i += 1
+            game.step()
+        return game
+
+    def matches(self, game):
+        return (game.tick, game.score, game.over) == (self.final_tick, self.final_score, self.finished)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay recorded games headless and check they end the same way.")
+    parser.add_argument('replays', nargs='+')
+    parser.add_argument('--repeat', type=int, default=1, help="play each replay this many times (for timing)")
+    args = parser.parse_args(argv)
+
+    mismatches = 0
+    for path in args.replays:
+        replay = Replay.load(path)
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            game = replay.play()
+        elapsed = time.perf_counter() - start
+        ok = replay.matches(game)
+        mismatches += not ok
+        rate = game.tick * args.repeat / elapsed if elapsed > 0 else float('inf')
+        print(f"{path}: {'ok' if ok else 'MISMATCH'} ticks={game.tick}/{replay.final_tick} "
+              f"score={game.score}/{replay.final_score} inputs={len(replay.inputs)} {rate:.0f} ticks/s")
+    return 1 if mismatches else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,277 @@
+# Pencere açmadan, betikli botlarla binlerce oyunu tüm çekirdeklerde oynatır; denge ayarlarını (büyüme, güçlendirme
+# olasılığı ve hızı, yem aralığı) bir parametre ızgarası üzerinde tarar ve her ayar için toplu istatistikleri
+# tamamlandıkça bir JSON Lines dosyasına yazar.
+#
+#   python selfplay.py --games 2000 --grid growth_per_food=3,5,8 --grid powerup_spawn_chance=0.1,0.2,0.4
+import argparse
+import itertools
+import json
+import math
+import multiprocessing
+import os
+import random
+import statistics
+import sys
+import time
+
+from engine import GameConfig, Game, EVENT_EAT, EVENT_GAME_OVER, SIMULATION_STEP
+
+SWEEP_PARAMETERS = ('growth_per_food', 'powerup_spawn_chance', 'powerup_speed_multiplier', 'food_spawn_buffer')
+ARENA_WIDTH = 720
+ARENA_HEIGHT = 1220
+MAX_TICKS = 36000
+STUCK_TICKS = 3600  # bir dakika boyunca hiç yem yenmezse oyun takılmış sayılır
+CHUNK_GAMES = 10
+SPAWN_STALL_SECONDS = SIMULATION_STEP / 2  # tek başına bir adım bütçesinin yarısını yiyen yerleştirme
+SCORE_PERCENTILES = (10, 25, 50, 75, 90, 99)
+WANDER_TURN_CHANCE = 0.05
+DIRECTIONS = ([0, -1], [0, 1], [-1, 0], [1, 0])
+
+def is_safe(snake, config, direction, lookahead, wall_steps=None):
+    # Bu yönde `lookahead` adım boyunca duvara ya da gövdeye çarpılmıyorsa güvenlidir (gövde sabit varsayılır).
+    # wall_steps verilirse duvar yalnızca ilk o kadar adımda aranır: hedef yakındaysa ondan sonrası önemsizdir.
+    x, y = snake.head_pos
+    step = snake.speed
+    limit_x, limit_y = config.width - config.head_radius, config.height - config.head_radius
+    wall_steps = lookahead if wall_steps is None else wall_steps
+    for i in range(1, lookahead + 1):
+        px, py = x + direction[0] * step * i, y + direction[1] * step * i
+        if i <= wall_steps and not (config.head_radius < px < limit_x and config.head_radius < py < limit_y):
+            return False
+        if snake.is_near(px, py, config.collision_threshold, skip=2):
+            return False
+    return True
+
+def turn_options(snake):
+    dx, dy = snake.direction
+    return [d for d in DIRECTIONS if not (d[0] == -dx and d[1] == -dy)]
+
+class GreedyBot:
+    # En yakın yeme doğru, önündeki birkaç adımı güvenli olan yönlerden en çok yaklaştıranı seçer
+    def __init__(self, config, rng):
+        self.config = config
+        self.lookahead = max(2, int(config.head_radius * 2 // config.snake_speed))
+
+    def choose(self, game):
+        snake = game.snake
+        head = snake.head_pos
+        if not game.foods:
+            return None
+        target = min(game.foods, key=lambda f: (f.position[0] - head[0]) ** 2 + (f.position[1] - head[1]) ** 2).position
+        step = snake.speed
+        safe = [d for d in turn_options(snake)
+                if is_safe(snake, self.config, d, self.lookahead, self.wall_steps(head, target, d, step))]
+        if not safe:
+            return None
+        return min(safe, key=lambda d: abs(target[0] - head[0] - d[0] * step) + abs(target[1] - head[1] - d[1] * step))
+
+    def wall_steps(self, head, target, direction, step):
+        # Duvar kenarındaki (FOOD_MARGIN içindeki) bir yeme ulaşmak için baş, tam bakış mesafesinin izin vermediği
+        # kadar duvara yaklaşmalıdır; yeme doğru giderken duvar yalnızca yem yenebilecek uzaklığa kadar aranır
+        along = (target[0] - head[0]) * direction[0] + (target[1] - head[1]) * direction[1]
+        if along <= 0:
+            return None
+        return max(1, math.ceil((along - self.config.head_radius) / step))
+
+class WanderBot:
+    # Çoğunlukla düz gider, ara sıra rastgele döner; yalnızca önü kapanınca kaçar
+    def __init__(self, config, rng):
+        self.config = config
+        self.random = rng
+        self.lookahead = max(2, int(config.head_radius * 2 // config.snake_speed))
+
+    def choose(self, game):
+        snake = game.snake
+        ahead_safe = is_safe(snake, self.config, snake.direction, self.lookahead)
+        if ahead_safe and self.random.random() >= WANDER_TURN_CHANCE:
+            return None
+        safe = [d for d in turn_options(snake) if d != snake.direction and is_safe(snake, self.config, d, self.lookahead)]
+        return self.random.choice(safe) if safe else None
+
+POLICIES = {'greedy': GreedyBot, 'wander': WanderBot}
+
+class SpawnTimer:
+    # Game.profiler yerine takılır; yalnızca yem yerleştirme sürelerini toplar
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0
+        self.slowest = 0.0
+        self.stalls = 0
+
+    def add(self, phase, seconds):
+        if phase != 'food_spawn':
+            return
+        self.calls += 1
+        self.total += seconds
+        if seconds > self.slowest:
+            self.slowest = seconds
+        if seconds > SPAWN_STALL_SECONDS:
+            self.stalls += 1
+
+_games = {}
+
+def play_game(game, policy, seed, max_ticks, stuck_ticks=STUCK_TICKS):
+    # `stuck_ticks` adım boyunca hiç yem yenmezse oyun 'stuck' nedeniyle kesilir; 'timeout' yalnızca ilerleyen
+    # ama max_ticks'e ulaşan oyunlardır.
+    game.reset(seed)
+    bot = policy(game.config, random.Random(seed))
+    snake = game.snake
+    reason = 'timeout'
+    last_eat = 0
+    while game.tick < max_ticks:
+        direction = bot.choose(game)
+        if direction is not None:
+            snake.change_direction(direction)
+        events = game.step()
+        if game.over:
+            reason = next(data for event, data in events if event == EVENT_GAME_OVER)
+            break
+        if any(event == EVENT_EAT for event, _ in events):
+            last_eat = game.tick
+        elif game.tick - last_eat >= stuck_ticks:
+            reason = 'stuck'
+            break
+    return game.score, game.tick, reason
+
+def play_chunk(task):
+    # İşçi süreçte çalışır; Game nesnesi aynı ayar için süreç içinde yeniden kullanılır
+    combo, params, policy_name, seeds, max_ticks, stuck_ticks, arena = task
+    key = (tuple(sorted(params.items())), arena)
+    game = _games.get(key)
+    if game is None:
+        width, height, density = arena
+        game = _games[key] = Game(GameConfig(width, height, density=density, **params))
+    timer = SpawnTimer()
+    game.profiler = timer
+    policy = POLICIES[policy_name]
+    start = time.perf_counter()
+    results = [play_game(game, policy, seed, max_ticks, stuck_ticks) for seed in seeds]
+    elapsed = time.perf_counter() - start
+    spawn = (timer.calls, timer.total, timer.slowest, timer.stalls)
+    return combo, results, spawn, os.getpid(), sum(r[1] for r in results), elapsed
+
+def percentile(values, p):
+    return values[max(0, math.ceil(p * len(values) / 100) - 1)]
+
+def summarize(params, policy, results, spawn):
+    scores = sorted(r[0] for r in results)
+    ticks = sorted(r[1] for r in results)
+    reasons = {}
+    for r in results:
+        reasons[r[2]] = reasons.get(r[2], 0) + 1
+    calls, total, slowest, stalls = spawn
+    return {
+        'type': 'combo',
+        'params': params,
+        'policy': policy,
+        'games': len(results),
+        'score': {
+            'mean': statistics.fmean(scores),
+            'stdev': statistics.pstdev(scores),
+            'min': scores[0],
+            'max': scores[-1],
+            **{f"p{p}": percentile(scores, p) for p in SCORE_PERCENTILES},
+        },
+        'ticks': {
+            'mean': statistics.fmean(ticks),
+            'p50': percentile(ticks, 50),
+            'p90': percentile(ticks, 90),
+            'max': ticks[-1],
+        },
+        'end_reasons': reasons,
+        'spawn': {
+            'calls': calls,
+            'mean_ms': total / calls * 1000 if calls else 0.0,
+            'max_ms': slowest * 1000,
+            'stalls': stalls,
+        },
+    }
+
+def parse_grid(specs):
+    # "ad=d1,d2,..." biçimindeki her tarama ekseni; değerler GameConfig birimlerindedir (piksel, oran)
+    axes = {}
+    for spec in specs:
+        name, _, values = spec.partition('=')
+        if name not in SWEEP_PARAMETERS or not values:
+            raise argparse.ArgumentTypeError(f"grid axis must be one of {', '.join(SWEEP_PARAMETERS)}: {spec}")
+        axes[name] = [int(v) if v.lstrip('-').isdigit() else float(v) for v in values.split(',')]
+    names = list(axes)
+    return [dict(zip(names, combo)) for combo in itertools.product(*(axes[n] for n in names))]
+
+def build_tasks(combos, policies, games, seed, chunk, max_ticks, stuck_ticks, arena):
+    # Aynı oyun numarası her ayarda aynı tohumu kullanır; ayarlar eşleştirilmiş örneklerle karşılaştırılır
+    tasks = []
+    for combo, (params, policy) in enumerate(itertools.product(combos, policies)):
+        for first in range(0, games, chunk):
+            seeds = list(range(seed + first, seed + min(games, first + chunk)))
+            tasks.append((combo, params, policy, seeds, max_ticks, stuck_ticks, arena))
+    return tasks
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless self-play for balance tuning.")
+    parser.add_argument('--games', type=int, default=1000, help="games per parameter combination and policy")
+    parser.add_argument('--grid', action='append', default=[], metavar='NAME=V1,V2,...',
+                        help=f"sweep axis, one of {', '.join(SWEEP_PARAMETERS)} (repeatable)")
+    parser.add_argument('--policy', nargs='+', choices=sorted(POLICIES), default=['greedy'])
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--chunk', type=int, default=CHUNK_GAMES, help="games per task sent to a worker")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--max-ticks', type=int, default=MAX_TICKS)
+    parser.add_argument('--stuck-ticks', type=int, default=STUCK_TICKS,
+                        help="end a game as 'stuck' after this many ticks without eating")
+    parser.add_argument('--width', type=float, default=ARENA_WIDTH)
+    parser.add_argument('--height', type=float, default=ARENA_HEIGHT)
+    parser.add_argument('--density', type=float, default=1.0)
+    parser.add_argument('--out', default='selfplay.jsonl', help="JSON Lines results file")
+    args = parser.parse_args(argv)
+
+    try:
+        combos = parse_grid(args.grid)
+    except argparse.ArgumentTypeError as e:
+        parser.error(str(e))
+    arena = (args.width, args.height, args.density)
+    tasks = build_tasks(combos, args.policy, args.games, args.seed, args.chunk, args.max_ticks, args.stuck_ticks, arena)
+    labels = list(itertools.product(combos, args.policy))
+    pending = {combo: [] for combo in range(len(labels))}
+    spawn = {combo: [0, 0.0, 0.0, 0] for combo in range(len(labels))}
+    workers = {}
+
+    start = time.perf_counter()
+    with open(args.out, "w") as out, multiprocessing.Pool(args.workers) as pool:
+        for combo, results, (calls, total, slowest, stalls), pid, ticks, elapsed in pool.imap_unordered(play_chunk, tasks):
+            pending[combo].extend(results)
+            totals = spawn[combo]
+            totals[0] += calls
+            totals[1] += total
+            totals[2] = max(totals[2], slowest)
+            totals[3] += stalls
+            worker = workers.setdefault(pid, [0, 0.0, 0])
+            worker[0] += ticks
+            worker[1] += elapsed
+            worker[2] += len(results)
+            if len(pending[combo]) == args.games:
+                params, policy = labels[combo]
+                summary = summarize(params, policy, pending.pop(combo), totals)
+                out.write(json.dumps(summary) + "\n")
+                out.flush()
+                score = summary['score']
+                reasons = summary['end_reasons']
+                print(f"{policy:<7} {json.dumps(params):<60} score mean={score['mean']:.1f} p50={score['p50']} "
+                      f"p90={score['p90']} ticks p50={summary['ticks']['p50']} stuck={reasons.get('stuck', 0)} "
+                      f"timeout={reasons.get('timeout', 0)} stalls={summary['spawn']['stalls']}")
+        wall = time.perf_counter() - start
+        per_worker = {str(pid): {'games': games, 'ticks': ticks, 'ticks_per_sec': ticks / busy if busy else 0.0}
+                      for pid, (ticks, busy, games) in workers.items()}
+        total_ticks = sum(w[0] for w in workers.values())
+        out.write(json.dumps({
+            'type': 'workers',
+            'workers': per_worker,
+            'total_ticks': total_ticks,
+            'wall_seconds': wall,
+            'ticks_per_sec': total_ticks / wall if wall else 0.0,
+        }) + "\n")
+    print(f"{len(workers)} workers, {total_ticks / wall:.0f} ticks/s total in {wall:.1f}s -> {args.out}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,63 @@
+# Derleme öncesi varlık adımı: buildozer'dan önce çalıştırılır (python tools/build_assets.py).
+# Tekrarlanan arka plan dokusunu yoğunluk sınıflarına göre 2'nin kuvveti boyutlarda küçültür, opak
+# görselleri JPEG olarak sıkıştırır ve presplash/ikon sürümlerini üretir.
+import argparse
+import os
+import sys
+
+try:
+    from PIL import Image
+except ImportError:
+    sys.exit("build_assets.py requires Pillow (pip install pillow)")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+OUTPUT_DIR = os.path.join(ROOT, 'assets')
+BACKGROUND_SOURCE = 'image.png'
+# GL ES 2'de 'repeat' için kenarlar 2'nin kuvveti olmalıdır
+BACKGROUND_SIZES = (256, 512, 1024)
+MENU_SOURCE = 'menu_image.png'
+PRESPLASH_SIZE = 512
+ICON_SIZE = 512
+JPEG_QUALITY = 85
+
+def is_power_of_two(n):
+    return n > 0 and n & (n - 1) == 0
+
+def resized(path, size):
+    image = Image.open(os.path.join(ROOT, path))
+    if image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA' if 'transparency' in image.info else 'RGB')
+    if image.size != (size, size):
+        image = image.resize((size, size), Image.LANCZOS)
+    return image
+
+def save(image, name, quality):
+    # Saydamlığı olmayan görseller JPEG, diğerleri optimize edilmiş PNG olarak yazılır
+    if image.mode == 'RGB' and name.endswith('.jpg'):
+        image.save(os.path.join(OUTPUT_DIR, name), quality=quality, optimize=True, progressive=False)
+    else:
+        image.save(os.path.join(OUTPUT_DIR, name.rsplit('.', 1)[0] + '.png'), optimize=True)
+    print(f"  {name}")
+
+def build_backgrounds(quality):
+    for size in BACKGROUND_SIZES:
+        if not is_power_of_two(size):
+            raise ValueError(f"background size must be a power of two: {size}")
+        save(resized(BACKGROUND_SOURCE, size), f'background-{size}.jpg', quality)
+
+def build_launcher_images(quality):
+    save(resized(MENU_SOURCE, PRESPLASH_SIZE), 'presplash.jpg', quality)
+    resized(MENU_SOURCE, ICON_SIZE).save(os.path.join(OUTPUT_DIR, 'icon.png'), optimize=True)
+    print("  icon.png")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build downscaled/compressed game textures into assets/.")
+    parser.add_argument('--quality', type=int, default=JPEG_QUALITY)
+    args = parser.parse_args(argv)
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    print(f"writing {OUTPUT_DIR}")
+    build_backgrounds(args.quality)
+    build_launcher_images(args.quality)
+
+if __name__ == '__main__':
+    main()